@@ -12,159 +12,349 @@ Generates realistic FHIR bundles for all 7 ABDM Health Information Types:
 7. HealthDocumentRecord
 """
 
-import json
+import os
+import re
+import mmap
+import sys
+import inspect
 import random
 import argparse
-import uuid
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict
-from faker import Faker
-
-fake = Faker(['en_IN'])
+from itertools import permutations
+from typing import List, Dict, Callable, Iterable, Optional, Sequence, Tuple
+import numpy as np
+import orjson
+
+# Code systems and profile URIs shared by every bundle, interned so all
+# bundles reference a single string object for each.
+SNOMED_SYSTEM = sys.intern("http://snomed.info/sct")
+LOINC_SYSTEM = sys.intern("http://loinc.org")
+BUNDLE_IDENTIFIER_SYSTEM = sys.intern("https://ndhm.in/bundle")
+BUNDLE_PROFILE = sys.intern("https://nrces.in/ndhm/fhir/r4/StructureDefinition/DocumentBundle")
+
+# Random bytes for ids are drawn from a pooled os.urandom buffer rather than
+# building a uuid.UUID object per id.
+_RAND_POOL_SIZE = 4096
+_RAND_POOL = b""
+_RAND_OFF = 0
+
+# Reference time for a run: meta.lastUpdated for every bundle, and the anchor
+# for random clinical dates. Refreshed once at the start of main().
+_NOW = datetime.now()
+_NOW_ISO = _NOW.isoformat()
+_NOW_TS = int(_NOW.timestamp())
+
+# Composition type and section codings, identical in every bundle of a type
+# and shared by reference.
+_DISCHARGE_SUMMARY_TYPE = {
+    "coding": [{
+        "system": SNOMED_SYSTEM,
+        "code": "373942005",
+        "display": "Discharge Summary"
+    }],
+    "text": "Discharge Summary"
+}
+
+_PRESCRIPTION_TYPE = {
+    "coding": [{
+        "system": SNOMED_SYSTEM,
+        "code": "440545006",
+        "display": "Prescription record"
+    }],
+    "text": "Prescription"
+}
+
+_DIAGNOSTIC_REPORT_TYPE = {
+    "coding": [{
+        "system": SNOMED_SYSTEM,
+        "code": "721981007",
+        "display": "Diagnostic Report"
+    }],
+    "text": "Diagnostic Report"
+}
+
+_MEDICATION_LIST_CODE = {
+    "coding": [{
+        "system": SNOMED_SYSTEM,
+        "code": "10160-0",
+        "display": "Medication list"
+    }]
+}
+
+_LAB_STUDIES_CODE = {
+    "coding": [{
+        "system": LOINC_SYSTEM,
+        "code": "30954-2",
+        "display": "Laboratory studies"
+    }]
+}
+
+# Discharge Summary sections whose content is the same for every bundle. They
+# are built once and shared by reference; only Medical History is per-patient.
+_DISCHARGE_SECTIONS_HEAD = (
+    {
+        "title": "Chief Complaints",
+        "code": {
+            "coding": [{
+                "system": SNOMED_SYSTEM,
+                "code": "422843007",
+                "display": "Chief complaint section"
+            }]
+        },
+        "text": {
+            "status": "generated",
+            "div": "<div>Patient presented with complaints of fever and cough for 5 days</div>"
+        }
+    },
+)
+
+# Medical History div per patient id; patients recur across bundles.
+_CONDITIONS_DIV_CACHE: Dict[str, str] = {}
+
+_DISCHARGE_HISTORY_CODE = {
+    "coding": [{
+        "system": SNOMED_SYSTEM,
+        "code": "371529009",
+        "display": "History and physical report"
+    }]
+}
+
+_DISCHARGE_SECTIONS_TAIL = (
+    {
+        "title": "Hospital Course",
+        "text": {
+            "status": "generated",
+            "div": "<div>Patient admitted and treated with antibiotics. Condition improved over 5 days.</div>"
+        }
+    },
+    {
+        "title": "Discharge Medications",
+        "code": {
+            "coding": [{
+                "system": SNOMED_SYSTEM,
+                "code": "10183-2",
+                "display": "Discharge medication"
+            }]
+        },
+        "text": {
+            "status": "generated",
+            "div": "<div>1. Azithromycin 500mg OD for 5 days<br/>2. Paracetamol 650mg TDS PRN</div>"
+        }
+    },
+    {
+        "title": "Follow-up",
+        "text": {
+            "status": "generated",
+            "div": "<div>Follow-up after 1 week</div>"
+        }
+    },
+)
+
+_PRESCRIPTION_MEDICATIONS = [
+    {"name": "Metformin", "dose": "500mg", "frequency": "BD (Twice daily)", "duration": "30 days"},
+    {"name": "Amlodipine", "dose": "5mg", "frequency": "OD (Once daily)", "duration": "30 days"},
+    {"name": "Atorvastatin", "dose": "10mg", "frequency": "HS (At bedtime)", "duration": "30 days"},
+    {"name": "Aspirin", "dose": "75mg", "frequency": "OD (Once daily)", "duration": "30 days"},
+    {"name": "Pantoprazole", "dose": "40mg", "frequency": "OD (Once daily)", "duration": "30 days"},
+]
+
+# Table markup is rendered once at import: each medication row is a fixed
+# string, and the lab table is a single format string with one slot per
+# result value, in the order of the lab_values tuple.
+_PRESCRIPTION_TABLE_HEAD = "<div><table><tr><th>Medicine</th><th>Dose</th><th>Frequency</th><th>Duration</th></tr>"
+_PRESCRIPTION_MED_ROWS = tuple(
+    f"<tr><td>{m['name']}</td><td>{m['dose']}</td><td>{m['frequency']}</td><td>{m['duration']}</td></tr>"
+    for m in _PRESCRIPTION_MEDICATIONS
+)
+# Complete medication table for every ordered selection of 2-4 medications
+# (200 in all), keyed by the tuple of medication indices.
+_PRESCRIPTION_DIVS = {
+    selection: _PRESCRIPTION_TABLE_HEAD + "".join([_PRESCRIPTION_MED_ROWS[j] for j in selection]) + "</table></div>"
+    for k in range(2, 5)
+    for selection in permutations(range(len(_PRESCRIPTION_MEDICATIONS)), k)
+}
+
+_LAB_TESTS = (
+    # (name, value format spec, unit, reference range)
+    ("Hemoglobin", ".1f", "g/dL", "12-16"),
+    ("Total WBC Count", "", "cells/cumm", "4000-11000"),
+    ("Blood Sugar (Fasting)", "", "mg/dL", "70-110"),
+    ("Serum Creatinine", ".2f", "mg/dL", "0.6-1.2"),
+    ("Total Cholesterol", "", "mg/dL", "<200"),
+)
+_LAB_TABLE_DIV = (
+    "<div><table><tr><th>Test</th><th>Result</th><th>Unit</th><th>Reference Range</th></tr>" +
+    "".join([f"<tr><td>{name}</td><td>{{{i}:{spec}}}</td><td>{unit}</td><td>{ref}</td></tr>"
+             for i, (name, spec, unit, ref) in enumerate(_LAB_TESTS)]) +
+    "</table></div>"
+)
 
 
 def load_data(filepath: str) -> List[Dict]:
-    """Load JSON data from file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load JSON data from file, parsing straight from a read-only memory map."""
+    with open(filepath, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def load_data_lines(filepath: str) -> List[Dict]:
+    """Load newline-delimited JSON data, one record per non-blank line."""
+    with open(filepath, 'rb') as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+
+def _rand_bytes(n: int) -> bytes:
+    """Return n random bytes sliced from the pooled buffer, refilling as needed."""
+    global _RAND_POOL, _RAND_OFF
+    if _RAND_OFF + n > len(_RAND_POOL):
+        _RAND_POOL = os.urandom(_RAND_POOL_SIZE)
+        _RAND_OFF = 0
+    start = _RAND_OFF
+    _RAND_OFF = start + n
+    return _RAND_POOL[start:_RAND_OFF]
+
+
+def _random_past_datetime(min_days_ago: int, max_days_ago: int) -> datetime:
+    """Random datetime between max_days_ago and min_days_ago days before the run started."""
+    return datetime.fromtimestamp(random.randint(_NOW_TS - max_days_ago * 86400, _NOW_TS - min_days_ago * 86400))
+
+
+def _conditions_div(patient: Dict) -> str:
+    """Medical History narrative for a patient, cached by patient id."""
+    div = _CONDITIONS_DIV_CACHE.get(patient['id'])
+    if div is None:
+        conditions = patient.get('conditions')
+        if conditions:
+            div = f"<div>Known conditions: {', '.join([c['code']['text'] for c in conditions])}</div>"
+        else:
+            div = "<div>No known medical conditions</div>"
+        _CONDITIONS_DIV_CACHE[patient['id']] = div
+    return div
 
 
 def generate_bundle_id() -> str:
-    """Generate a unique bundle ID."""
-    return str(uuid.uuid4())
+    """Generate a unique bundle ID (random UUID v4 string)."""
+    raw = _rand_bytes(16)
+    h = raw.hex()
+    return f"{h[0:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[raw[8] & 3]}{h[17:20]}-{h[20:32]}"
+
+
+def generate_short_id() -> str:
+    """Generate an 8 hex character ID suffix."""
+    return _rand_bytes(4).hex()
 
 
 def generate_composition_id() -> str:
     """Generate a unique composition ID."""
-    return f"Composition-{uuid.uuid4().hex[:8]}"
+    return f"Composition-{generate_short_id()}"
 
 
-def generate_discharge_summary(patient: Dict, practitioner: Dict, organization: Dict) -> Dict:
-    """Generate a Discharge Summary FHIR bundle."""
+def _discharge_summary_fields(patient: Dict, practitioner: Dict, organization: Dict,
+                              stay_days: Optional[int] = None) -> Dict:
+    """Draw the variable fields of a Discharge Summary bundle."""
 
     bundle_id = generate_bundle_id()
     composition_id = generate_composition_id()
-    encounter_id = f"Encounter-{uuid.uuid4().hex[:8]}"
+    encounter_id = f"Encounter-{generate_short_id()}"
 
     # Admission and discharge dates
-    admission_date = fake.date_time_between(start_date='-30d', end_date='-7d')
-    discharge_date = admission_date + timedelta(days=random.randint(2, 10))
+    admission_date = _random_past_datetime(7, 30)
+    if stay_days is None:
+        stay_days = random.randint(2, 10)
+    discharge_date = admission_date + timedelta(days=stay_days)
+
+    return {
+        "bundle_id": bundle_id,
+        "composition_id": composition_id,
+        "composition_url": f"urn:uuid:{composition_id}",
+        "last_updated": _NOW_ISO,
+        "patient": patient,
+        "patient_ref": f"Patient/{patient['id']}",
+        "patient_display": patient['name'][0]['text'],
+        "practitioner": practitioner,
+        "practitioner_ref": f"Practitioner/{practitioner['id']}",
+        "practitioner_display": practitioner['name'][0]['text'],
+        "organization": organization,
+        "organization_ref": f"Organization/{organization['id']}",
+        "organization_display": organization['name'],
+        "timestamp": discharge_date.isoformat(),
+        "encounter_ref": f"Encounter/{encounter_id}",
+        "history_div": _conditions_div(patient),
+    }
+
+
+def _build_discharge_summary(
+        *, bundle_id: str, composition_id: str, composition_url: str, timestamp: str,
+        last_updated: str, patient: Dict, patient_ref: str, patient_display: str,
+        practitioner: Dict, practitioner_ref: str, practitioner_display: str,
+        organization: Dict, organization_ref: str, organization_display: str,
+        encounter_ref: str, history_div: str) -> Dict:
+    """Assemble a Discharge Summary bundle from its variable fields."""
+
+    history_section = {
+        "title": "Medical History",
+        "code": _DISCHARGE_HISTORY_CODE,
+        "text": {
+            "status": "generated",
+            "div": history_div
+        }
+    }
 
     bundle = {
         "resourceType": "Bundle",
         "id": bundle_id,
         "type": "document",
-        "timestamp": discharge_date.isoformat(),
+        "timestamp": timestamp,
         "identifier": {
-            "system": "https://ndhm.in/bundle",
+            "system": BUNDLE_IDENTIFIER_SYSTEM,
             "value": bundle_id
         },
         "meta": {
-            "profile": ["https://nrces.in/ndhm/fhir/r4/StructureDefinition/DocumentBundle"],
-            "lastUpdated": datetime.now().isoformat()
+            "profile": [BUNDLE_PROFILE],
+            "lastUpdated": last_updated
         },
         "entry": [
             {
-                "fullUrl": f"urn:uuid:{composition_id}",
+                "fullUrl": composition_url,
                 "resource": {
                     "resourceType": "Composition",
                     "id": composition_id,
                     "status": "final",
-                    "type": {
-                        "coding": [{
-                            "system": "http://snomed.info/sct",
-                            "code": "373942005",
-                            "display": "Discharge Summary"
-                        }],
-                        "text": "Discharge Summary"
-                    },
+                    "type": _DISCHARGE_SUMMARY_TYPE,
                     "subject": {
-                        "reference": f"Patient/{patient['id']}",
-                        "display": patient['name'][0]['text']
+                        "reference": patient_ref,
+                        "display": patient_display
                     },
                     "encounter": {
-                        "reference": f"Encounter/{encounter_id}"
+                        "reference": encounter_ref
                     },
-                    "date": discharge_date.isoformat(),
+                    "date": timestamp,
                     "author": [{
-                        "reference": f"Practitioner/{practitioner['id']}",
-                        "display": practitioner['name'][0]['text']
+                        "reference": practitioner_ref,
+                        "display": practitioner_display
                     }],
                     "title": "Discharge Summary",
                     "custodian": {
-                        "reference": f"Organization/{organization['id']}",
-                        "display": organization['name']
+                        "reference": organization_ref,
+                        "display": organization_display
                     },
-                    "section": [
-                        {
-                            "title": "Chief Complaints",
-                            "code": {
-                                "coding": [{
-                                    "system": "http://snomed.info/sct",
-                                    "code": "422843007",
-                                    "display": "Chief complaint section"
-                                }]
-                            },
-                            "text": {
-                                "status": "generated",
-                                "div": "<div>Patient presented with complaints of fever and cough for 5 days</div>"
-                            }
-                        },
-                        {
-                            "title": "Medical History",
-                            "code": {
-                                "coding": [{
-                                    "system": "http://snomed.info/sct",
-                                    "code": "371529009",
-                                    "display": "History and physical report"
-                                }]
-                            },
-                            "text": {
-                                "status": "generated",
-                                "div": f"<div>Known conditions: {', '.join([c['code']['text'] for c in patient.get('conditions', [])])}</div>" if patient.get('conditions') else "<div>No known medical conditions</div>"
-                            }
-                        },
-                        {
-                            "title": "Hospital Course",
-                            "text": {
-                                "status": "generated",
-                                "div": "<div>Patient admitted and treated with antibiotics. Condition improved over 5 days.</div>"
-                            }
-                        },
-                        {
-                            "title": "Discharge Medications",
-                            "code": {
-                                "coding": [{
-                                    "system": "http://snomed.info/sct",
-                                    "code": "10183-2",
-                                    "display": "Discharge medication"
-                                }]
-                            },
-                            "text": {
-                                "status": "generated",
-                                "div": "<div>1. Azithromycin 500mg OD for 5 days<br/>2. Paracetamol 650mg TDS PRN</div>"
-                            }
-                        },
-                        {
-                            "title": "Follow-up",
-                            "text": {
-                                "status": "generated",
-                                "div": "<div>Follow-up after 1 week</div>"
-                            }
-                        }
-                    ]
+                    "section": [*_DISCHARGE_SECTIONS_HEAD, history_section, *_DISCHARGE_SECTIONS_TAIL]
                 }
             },
             {
-                "fullUrl": f"Patient/{patient['id']}",
+                "fullUrl": patient_ref,
                 "resource": patient
             },
             {
-                "fullUrl": f"Practitioner/{practitioner['id']}",
+                "fullUrl": practitioner_ref,
                 "resource": practitioner
             },
             {
-                "fullUrl": f"Organization/{organization['id']}",
+                "fullUrl": organization_ref,
                 "resource": organization
             }
         ]
@@ -173,96 +363,111 @@ def generate_discharge_summary(patient: Dict, practitioner: Dict, organization:
     return bundle
 
 
-def generate_prescription(patient: Dict, practitioner: Dict, organization: Dict) -> Dict:
-    """Generate a Prescription FHIR bundle."""
+def generate_discharge_summary(patient: Dict, practitioner: Dict, organization: Dict,
+                               stay_days: Optional[int] = None) -> Dict:
+    """Generate a Discharge Summary FHIR bundle.
+
+    stay_days is the pre-drawn length of stay; drawn here when omitted.
+    """
+    return _build_discharge_summary(**_discharge_summary_fields(patient, practitioner, organization, stay_days))
+
+
+def _prescription_fields(patient: Dict, practitioner: Dict, organization: Dict,
+                         med_indices: Optional[Sequence[int]] = None) -> Dict:
+    """Draw the variable fields of a Prescription bundle."""
 
     bundle_id = generate_bundle_id()
     composition_id = generate_composition_id()
 
-    prescription_date = fake.date_time_between(start_date='-30d', end_date='now')
+    prescription_date = _random_past_datetime(0, 30)
+
+    if med_indices is None:
+        med_indices = random.sample(range(len(_PRESCRIPTION_MEDICATIONS)), random.randint(2, 4))
+
+    return {
+        "bundle_id": bundle_id,
+        "composition_id": composition_id,
+        "composition_url": f"urn:uuid:{composition_id}",
+        "last_updated": _NOW_ISO,
+        "patient": patient,
+        "patient_ref": f"Patient/{patient['id']}",
+        "patient_display": patient['name'][0]['text'],
+        "practitioner": practitioner,
+        "practitioner_ref": f"Practitioner/{practitioner['id']}",
+        "practitioner_display": practitioner['name'][0]['text'],
+        "organization": organization,
+        "organization_ref": f"Organization/{organization['id']}",
+        "organization_display": organization['name'],
+        "timestamp": prescription_date.isoformat(),
+        "medication_div": _PRESCRIPTION_DIVS[tuple(med_indices)],
+    }
 
-    medications = [
-        {"name": "Metformin", "dose": "500mg", "frequency": "BD (Twice daily)", "duration": "30 days"},
-        {"name": "Amlodipine", "dose": "5mg", "frequency": "OD (Once daily)", "duration": "30 days"},
-        {"name": "Atorvastatin", "dose": "10mg", "frequency": "HS (At bedtime)", "duration": "30 days"},
-        {"name": "Aspirin", "dose": "75mg", "frequency": "OD (Once daily)", "duration": "30 days"},
-        {"name": "Pantoprazole", "dose": "40mg", "frequency": "OD (Once daily)", "duration": "30 days"},
-    ]
 
-    selected_meds = random.sample(medications, random.randint(2, 4))
+def _build_prescription(
+        *, bundle_id: str, composition_id: str, composition_url: str, timestamp: str,
+        last_updated: str, patient: Dict, patient_ref: str, patient_display: str,
+        practitioner: Dict, practitioner_ref: str, practitioner_display: str,
+        organization: Dict, organization_ref: str, organization_display: str,
+        medication_div: str) -> Dict:
+    """Assemble a Prescription bundle from its variable fields."""
 
     bundle = {
         "resourceType": "Bundle",
         "id": bundle_id,
         "type": "document",
-        "timestamp": prescription_date.isoformat(),
+        "timestamp": timestamp,
         "identifier": {
-            "system": "https://ndhm.in/bundle",
+            "system": BUNDLE_IDENTIFIER_SYSTEM,
             "value": bundle_id
         },
         "meta": {
-            "profile": ["https://nrces.in/ndhm/fhir/r4/StructureDefinition/DocumentBundle"],
-            "lastUpdated": datetime.now().isoformat()
+            "profile": [BUNDLE_PROFILE],
+            "lastUpdated": last_updated
         },
         "entry": [
             {
-                "fullUrl": f"urn:uuid:{composition_id}",
+                "fullUrl": composition_url,
                 "resource": {
                     "resourceType": "Composition",
                     "id": composition_id,
                     "status": "final",
-                    "type": {
-                        "coding": [{
-                            "system": "http://snomed.info/sct",
-                            "code": "440545006",
-                            "display": "Prescription record"
-                        }],
-                        "text": "Prescription"
-                    },
+                    "type": _PRESCRIPTION_TYPE,
                     "subject": {
-                        "reference": f"Patient/{patient['id']}",
-                        "display": patient['name'][0]['text']
+                        "reference": patient_ref,
+                        "display": patient_display
                     },
-                    "date": prescription_date.isoformat(),
+                    "date": timestamp,
                     "author": [{
-                        "reference": f"Practitioner/{practitioner['id']}",
-                        "display": practitioner['name'][0]['text']
+                        "reference": practitioner_ref,
+                        "display": practitioner_display
                     }],
                     "title": "Prescription",
                     "custodian": {
-                        "reference": f"Organization/{organization['id']}",
-                        "display": organization['name']
+                        "reference": organization_ref,
+                        "display": organization_display
                     },
                     "section": [
                         {
                             "title": "Medication List",
-                            "code": {
-                                "coding": [{
-                                    "system": "http://snomed.info/sct",
-                                    "code": "10160-0",
-                                    "display": "Medication list"
-                                }]
-                            },
+                            "code": _MEDICATION_LIST_CODE,
                             "text": {
                                 "status": "generated",
-                                "div": "<div><table><tr><th>Medicine</th><th>Dose</th><th>Frequency</th><th>Duration</th></tr>" +
-                                      "".join([f"<tr><td>{m['name']}</td><td>{m['dose']}</td><td>{m['frequency']}</td><td>{m['duration']}</td></tr>" for m in selected_meds]) +
-                                      "</table></div>"
+                                "div": medication_div
                             }
                         }
                     ]
                 }
             },
             {
-                "fullUrl": f"Patient/{patient['id']}",
+                "fullUrl": patient_ref,
                 "resource": patient
             },
             {
-                "fullUrl": f"Practitioner/{practitioner['id']}",
+                "fullUrl": practitioner_ref,
                 "resource": practitioner
             },
             {
-                "fullUrl": f"Organization/{organization['id']}",
+                "fullUrl": organization_ref,
                 "resource": organization
             }
         ]
@@ -271,95 +476,119 @@ def generate_prescription(patient: Dict, practitioner: Dict, organization: Dict)
     return bundle
 
 
-def generate_diagnostic_report(patient: Dict, practitioner: Dict, organization: Dict) -> Dict:
-    """Generate a Diagnostic Report FHIR bundle."""
+def generate_prescription(patient: Dict, practitioner: Dict, organization: Dict,
+                          med_indices: Optional[Sequence[int]] = None) -> Dict:
+    """Generate a Prescription FHIR bundle.
+
+    med_indices are pre-drawn positions into the medication list; a random
+    selection of 2-4 medications is drawn here when omitted.
+    """
+    return _build_prescription(**_prescription_fields(patient, practitioner, organization, med_indices))
+
+
+def _diagnostic_report_fields(patient: Dict, practitioner: Dict, organization: Dict,
+                              lab_values: Optional[Tuple[float, int, int, float, int]] = None) -> Dict:
+    """Draw the variable fields of a Diagnostic Report bundle."""
 
     bundle_id = generate_bundle_id()
     composition_id = generate_composition_id()
 
-    report_date = fake.date_time_between(start_date='-30d', end_date='now')
+    report_date = _random_past_datetime(0, 30)
 
     # Random lab test results
-    tests = [
-        {"name": "Hemoglobin", "value": f"{random.uniform(12.0, 16.0):.1f}", "unit": "g/dL", "range": "12-16"},
-        {"name": "Total WBC Count", "value": f"{random.randint(4000, 11000)}", "unit": "cells/cumm", "range": "4000-11000"},
-        {"name": "Blood Sugar (Fasting)", "value": f"{random.randint(70, 120)}", "unit": "mg/dL", "range": "70-110"},
-        {"name": "Serum Creatinine", "value": f"{random.uniform(0.6, 1.2):.2f}", "unit": "mg/dL", "range": "0.6-1.2"},
-        {"name": "Total Cholesterol", "value": f"{random.randint(150, 220)}", "unit": "mg/dL", "range": "<200"},
-    ]
+    if lab_values is None:
+        lab_values = (
+            random.uniform(12.0, 16.0),
+            random.randint(4000, 11000),
+            random.randint(70, 120),
+            random.uniform(0.6, 1.2),
+            random.randint(150, 220),
+        )
+
+    return {
+        "bundle_id": bundle_id,
+        "composition_id": composition_id,
+        "composition_url": f"urn:uuid:{composition_id}",
+        "last_updated": _NOW_ISO,
+        "patient": patient,
+        "patient_ref": f"Patient/{patient['id']}",
+        "patient_display": patient['name'][0]['text'],
+        "practitioner": practitioner,
+        "practitioner_ref": f"Practitioner/{practitioner['id']}",
+        "practitioner_display": practitioner['name'][0]['text'],
+        "organization": organization,
+        "organization_ref": f"Organization/{organization['id']}",
+        "organization_display": organization['name'],
+        "timestamp": report_date.isoformat(),
+        "lab_div": _LAB_TABLE_DIV.format(*lab_values),
+    }
+
+
+def _build_diagnostic_report(
+        *, bundle_id: str, composition_id: str, composition_url: str, timestamp: str,
+        last_updated: str, patient: Dict, patient_ref: str, patient_display: str,
+        practitioner: Dict, practitioner_ref: str, practitioner_display: str,
+        organization: Dict, organization_ref: str, organization_display: str,
+        lab_div: str) -> Dict:
+    """Assemble a Diagnostic Report bundle from its variable fields."""
 
     bundle = {
         "resourceType": "Bundle",
         "id": bundle_id,
         "type": "document",
-        "timestamp": report_date.isoformat(),
+        "timestamp": timestamp,
         "identifier": {
-            "system": "https://ndhm.in/bundle",
+            "system": BUNDLE_IDENTIFIER_SYSTEM,
             "value": bundle_id
         },
         "meta": {
-            "profile": ["https://nrces.in/ndhm/fhir/r4/StructureDefinition/DocumentBundle"],
-            "lastUpdated": datetime.now().isoformat()
+            "profile": [BUNDLE_PROFILE],
+            "lastUpdated": last_updated
         },
         "entry": [
             {
-                "fullUrl": f"urn:uuid:{composition_id}",
+                "fullUrl": composition_url,
                 "resource": {
                     "resourceType": "Composition",
                     "id": composition_id,
                     "status": "final",
-                    "type": {
-                        "coding": [{
-                            "system": "http://snomed.info/sct",
-                            "code": "721981007",
-                            "display": "Diagnostic Report"
-                        }],
-                        "text": "Diagnostic Report"
-                    },
+                    "type": _DIAGNOSTIC_REPORT_TYPE,
                     "subject": {
-                        "reference": f"Patient/{patient['id']}",
-                        "display": patient['name'][0]['text']
+                        "reference": patient_ref,
+                        "display": patient_display
                     },
-                    "date": report_date.isoformat(),
+                    "date": timestamp,
                     "author": [{
-                        "reference": f"Practitioner/{practitioner['id']}",
-                        "display": practitioner['name'][0]['text']
+                        "reference": practitioner_ref,
+                        "display": practitioner_display
                     }],
                     "title": "Laboratory Diagnostic Report",
                     "custodian": {
-                        "reference": f"Organization/{organization['id']}",
-                        "display": organization['name']
+                        "reference": organization_ref,
+                        "display": organization_display
                     },
                     "section": [
                         {
                             "title": "Laboratory Results",
-                            "code": {
-                                "coding": [{
-                                    "system": "http://loinc.org",
-                                    "code": "30954-2",
-                                    "display": "Laboratory studies"
-                                }]
-                            },
+                            "code": _LAB_STUDIES_CODE,
                             "text": {
                                 "status": "generated",
-                                "div": "<div><table><tr><th>Test</th><th>Result</th><th>Unit</th><th>Reference Range</th></tr>" +
-                                      "".join([f"<tr><td>{t['name']}</td><td>{t['value']}</td><td>{t['unit']}</td><td>{t['range']}</td></tr>" for t in tests]) +
-                                      "</table></div>"
+                                "div": lab_div
                             }
                         }
                     ]
                 }
             },
             {
-                "fullUrl": f"Patient/{patient['id']}",
+                "fullUrl": patient_ref,
                 "resource": patient
             },
             {
-                "fullUrl": f"Practitioner/{practitioner['id']}",
+                "fullUrl": practitioner_ref,
                 "resource": practitioner
             },
             {
-                "fullUrl": f"Organization/{organization['id']}",
+                "fullUrl": organization_ref,
                 "resource": organization
             }
         ]
@@ -368,60 +597,275 @@ def generate_diagnostic_report(patient: Dict, practitioner: Dict, organization:
     return bundle
 
 
+def generate_diagnostic_report(patient: Dict, practitioner: Dict, organization: Dict,
+                               lab_values: Optional[Tuple[float, int, int, float, int]] = None) -> Dict:
+    """Generate a Diagnostic Report FHIR bundle.
+
+    lab_values holds pre-drawn (hemoglobin, wbc, fasting sugar, creatinine,
+    cholesterol) results; drawn here when omitted.
+    """
+    return _build_diagnostic_report(**_diagnostic_report_fields(patient, practitioner, organization, lab_values))
+
+
+class BundleTemplate:
+    """Compact JSON encoding of a bundle builder, pre-serialized around its fields.
+
+    The builder is run once with a sentinel string for every keyword field and
+    the output is split at the sentinels. Rendering a bundle is then a join of
+    the constant byte chunks and the orjson encoding of each field value, and
+    yields the same bytes as orjson.dumps(build(**fields)).
+    """
+
+    _SLOT = re.compile(rb'"@@slot:(\w+)@@"')
+
+    def __init__(self, build: Callable[..., Dict]):
+        sentinels = {name: f"@@slot:{name}@@" for name in inspect.signature(build).parameters}
+        parts = self._SLOT.split(orjson.dumps(build(**sentinels)))
+        self._head = parts[0]
+        # (field name, constant chunk that follows it)
+        self._slots = [(parts[i].decode(), parts[i + 1]) for i in range(1, len(parts), 2)]
+
+    def render(self, fields: Dict) -> bytes:
+        """Serialize one bundle from its field values."""
+        out = [self._head]
+        for name, chunk in self._slots:
+            out.append(orjson.dumps(fields[name]))
+            out.append(chunk)
+        return b"".join(out)
+
+
+def draw_discharge_batch(rng: np.random.Generator, n: int) -> List[int]:
+    """Pre-draw lengths of stay (days) for n Discharge Summary bundles."""
+    return rng.integers(2, 11, n).tolist()
+
+
+def draw_prescription_batch(rng: np.random.Generator, n: int) -> List[List[int]]:
+    """Pre-draw medication selections (2-4 distinct indices) for n Prescription bundles."""
+    counts = rng.integers(2, 5, n).tolist()
+    order = rng.random((n, len(_PRESCRIPTION_MEDICATIONS))).argsort(axis=1).tolist()
+    return [row[:k] for row, k in zip(order, counts)]
+
+
+def draw_lab_batch(rng: np.random.Generator, n: int) -> List[Tuple[float, int, int, float, int]]:
+    """Pre-draw lab result values for n Diagnostic Report bundles."""
+    return list(zip(
+        rng.uniform(12.0, 16.0, n).tolist(),
+        rng.integers(4000, 11001, n).tolist(),
+        rng.integers(70, 121, n).tolist(),
+        rng.uniform(0.6, 1.2, n).tolist(),
+        rng.integers(150, 221, n).tolist(),
+    ))
+
+
+# Each bundle type maps to (field sampler, bundle builder, batch sampler). The
+# batch sampler draws the random values for all bundles of that type in one
+# vectorized call.
+BUNDLE_GENERATORS = {
+    "DischargeSummary": (_discharge_summary_fields, _build_discharge_summary, draw_discharge_batch),
+    "Prescription": (_prescription_fields, _build_prescription, draw_prescription_batch),
+    "DiagnosticReport": (_diagnostic_report_fields, _build_diagnostic_report, draw_lab_batch),
+}
+_BUNDLE_TEMPLATES = {
+    bundle_type: BundleTemplate(build_func)
+    for bundle_type, (_, build_func, _) in BUNDLE_GENERATORS.items()
+}
+
+# Seed data for worker processes. _init_worker decodes it once per worker
+# from a shared memory block, so it is never pickled per worker or per task.
+_PATIENTS: List[Dict] = []
+_PRACTITIONERS: List[Dict] = []
+_ORGANIZATIONS: List[Dict] = []
+_DUMPS_OPTION = 0
+
+
+def _init_worker(seed_shm_name: str, seed_size: int, now_iso: str, now_ts: int, dumps_option: int) -> None:
+    """Worker initializer: install seed data, the run's reference time and output encoding.
+
+    The seed data is the orjson encoding of [patients, practitioners,
+    organizations] in the shared memory block seed_shm_name.
+    """
+    global _PATIENTS, _PRACTITIONERS, _ORGANIZATIONS, _NOW_ISO, _NOW_TS, _DUMPS_OPTION, _RAND_POOL, _RAND_OFF
+    shm = SharedMemory(name=seed_shm_name)
+    try:
+        _PATIENTS, _PRACTITIONERS, _ORGANIZATIONS = orjson.loads(bytes(shm.buf[:seed_size]))
+    finally:
+        shm.close()
+    _NOW_ISO, _NOW_TS = now_iso, now_ts
+    _DUMPS_OPTION = dumps_option
+    # A forked worker inherits the parent's id pool; discard it so that
+    # workers never hand out the same ids.
+    _RAND_POOL, _RAND_OFF = b"", 0
+
+
+def _make_one(task: Tuple) -> Tuple[str, bytes]:
+    """Generate and serialize one bundle in a worker process; returns (bundle id, JSON bytes)."""
+    bundle_type, patient_idx, practitioner_idx, organization_idx, draw = task
+    fields_func, build_func, _ = BUNDLE_GENERATORS[bundle_type]
+    fields = fields_func(_PATIENTS[patient_idx], _PRACTITIONERS[practitioner_idx],
+                         _ORGANIZATIONS[organization_idx], draw)
+    if _DUMPS_OPTION:
+        blob = orjson.dumps(build_func(**fields), option=_DUMPS_OPTION)
+    else:
+        # Compact output: splice the fields into the pre-serialized skeleton.
+        blob = _BUNDLE_TEMPLATES[bundle_type].render(fields)
+    return fields["bundle_id"], blob
+
+
+_WRITE_WITH_DIR_FD = os.open in os.supports_dir_fd
+
+
+def _write_bytes(path: str, data: bytes, dir_fd: Optional[int] = None) -> None:
+    """Write data to path, replacing any existing file.
+
+    With dir_fd, path is relative to that open directory.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+async def _write_files(items: Iterable[Tuple[str, bytes]], dir_fd: Optional[int] = None,
+                       batch_size: int = 256) -> int:
+    """Write (path, bytes) pairs from worker threads, a batch at a time.
+
+    The blocking writes run in threads while the worker processes keep
+    encoding the following bundles. A semaphore bounds the number of files
+    open at once. Returns the number of files written.
+    """
+    semaphore = asyncio.Semaphore(2 * (os.cpu_count() or 1))
+
+    async def write(path: str, data: bytes) -> None:
+        async with semaphore:
+            await asyncio.to_thread(_write_bytes, path, data, dir_fd)
+
+    written = 0
+    batch = []
+    for path, data in items:
+        batch.append(write(path, data))
+        if len(batch) >= batch_size:
+            await asyncio.gather(*batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        await asyncio.gather(*batch)
+        written += len(batch)
+    return written
+
+
 def main():
+    global _NOW_ISO, _NOW_TS
+
     parser = argparse.ArgumentParser(description='Generate FHIR bundles for ABDM Local Dev Kit')
     parser.add_argument('--num-bundles', type=int, default=10, help='Number of bundles per type to generate')
     parser.add_argument('--data-dir', type=str, default='data/seed', help='Directory containing patient/practitioner/org data')
     parser.add_argument('--output-dir', type=str, default='data/seed/sample_bundles', help='Output directory for bundles')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for generation (default: CPU count)')
+    parser.add_argument('--format', choices=['files', 'jsonl'], default='files',
+                        help='files: one JSON file per bundle; '
+                             'jsonl: one <BundleType>.jsonl per type with one bundle per line, plus index.json')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent JSON output for reading (files format only; jsonl is always compact)')
 
     args = parser.parse_args()
+    now = datetime.now()
+    _NOW_ISO = now.isoformat()
+    _NOW_TS = int(now.timestamp())
 
     # Load data
     print("Loading patient, practitioner, and organization data...")
-    patients = load_data(f"{args.data_dir}/patients.json")
+    patients_file = f"{args.data_dir}/patients.json"
+    if os.path.exists(patients_file):
+        patients = load_data(patients_file)
+    else:
+        # generate_patients.py --ndjson writes one patient per line instead
+        patients = load_data_lines(f"{args.data_dir}/patients.ndjson")
     practitioners = load_data(f"{args.data_dir}/practitioners.json")
     organizations = load_data(f"{args.data_dir}/organizations.json")
 
     print(f"Loaded {len(patients)} patients, {len(practitioners)} practitioners, {len(organizations)} organizations")
 
-    # Create output directory
-    import os
-    os.makedirs(args.output_dir, exist_ok=True)
+    # Create all output directories up front
+    output_dir = Path(args.output_dir)
+    type_dirs = {bundle_type: output_dir / bundle_type for bundle_type in BUNDLE_GENERATORS}
+    for path in (type_dirs.values() if args.format == 'files' else [output_dir]):
+        path.mkdir(parents=True, exist_ok=True)
 
-    bundle_generators = {
-        "DischargeSummary": generate_discharge_summary,
-        "Prescription": generate_prescription,
-        "DiagnosticReport": generate_diagnostic_report,
-    }
+    rng = np.random.default_rng()
 
     total_bundles = 0
-
-    for bundle_type, generator_func in bundle_generators.items():
-        print(f"\nGenerating {args.num_bundles} {bundle_type} bundles...")
-
-        type_dir = f"{args.output_dir}/{bundle_type}"
-        os.makedirs(type_dir, exist_ok=True)
-
-        for i in range(args.num_bundles):
-            patient = random.choice(patients)
-            practitioner = random.choice(practitioners)
-            organization = random.choice(organizations)
-
-            bundle = generator_func(patient, practitioner, organization)
-
-            filename = f"{type_dir}/{bundle_type}_{i+1:03d}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(bundle, f, indent=2, ensure_ascii=False)
-
-            total_bundles += 1
-
-        print(f"✅ Saved {args.num_bundles} {bundle_type} bundles to {type_dir}/")
+    # jsonl only: byte offset of each line -> bundle id, per output file
+    jsonl_index: Dict[str, Dict[int, str]] = {}
+    dumps_option = orjson.OPT_INDENT_2 if args.pretty and args.format == 'files' else 0
+
+    # Hand the seed data to the workers through shared memory, encoded once.
+    seed_blob = orjson.dumps([patients, practitioners, organizations])
+    seed_shm = SharedMemory(create=True, size=len(seed_blob))
+    try:
+        seed_shm.buf[:len(seed_blob)] = seed_blob
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(seed_shm.name, len(seed_blob), _NOW_ISO, _NOW_TS,
+                                           dumps_option)) as executor:
+            for bundle_type, (_, _, draw_batch) in BUNDLE_GENERATORS.items():
+                print(f"\nGenerating {args.num_bundles} {bundle_type} bundles...")
+
+                draws = draw_batch(rng, args.num_bundles)
+                tasks = list(zip(
+                    [bundle_type] * args.num_bundles,
+                    rng.integers(0, len(patients), args.num_bundles).tolist(),
+                    rng.integers(0, len(practitioners), args.num_bundles).tolist(),
+                    rng.integers(0, len(organizations), args.num_bundles).tolist(),
+                    draws,
+                ))
+
+                results = executor.map(_make_one, tasks, chunksize=64)
+
+                if args.format == 'jsonl':
+                    jsonl_name = f"{bundle_type}.jsonl"
+                    offsets = jsonl_index[jsonl_name] = {}
+                    offset = 0
+                    with open(f"{args.output_dir}/{jsonl_name}", 'wb') as f:
+                        for bundle_id, blob in results:
+                            offsets[offset] = bundle_id
+                            f.write(blob)
+                            f.write(b"\n")
+                            offset += len(blob) + 1
+                            total_bundles += 1
+
+                    print(f"✅ Saved {args.num_bundles} {bundle_type} bundles to {args.output_dir}/{jsonl_name}")
+                else:
+                    type_dir = type_dirs[bundle_type]
+                    # Where supported, create files relative to an open handle
+                    # on the directory instead of resolving the full path.
+                    dir_fd = os.open(type_dir, os.O_RDONLY) if _WRITE_WITH_DIR_FD else None
+                    prefix = "" if dir_fd is not None else f"{type_dir}/"
+                    try:
+                        total_bundles += asyncio.run(_write_files(
+                            ((f"{prefix}{bundle_type}_{i+1:03d}.json", blob)
+                             for i, (_, blob) in enumerate(results)),
+                            dir_fd=dir_fd,
+                        ))
+                    finally:
+                        if dir_fd is not None:
+                            os.close(dir_fd)
+
+                    print(f"✅ Saved {args.num_bundles} {bundle_type} bundles to {type_dir}/")
+    finally:
+        seed_shm.close()
+        seed_shm.unlink()
+
+    if args.format == 'jsonl':
+        with open(f"{args.output_dir}/index.json", 'wb') as f:
+            f.write(orjson.dumps(jsonl_index, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     print("\n" + "="*50)
     print("BUNDLE GENERATION SUMMARY")
     print("="*50)
     print(f"Total Bundles Generated: {total_bundles}")
-    for bundle_type in bundle_generators.keys():
+    for bundle_type in BUNDLE_GENERATORS.keys():
         print(f"  - {bundle_type}: {args.num_bundles}")
     print("\n✅ Bundle generation complete!")
 
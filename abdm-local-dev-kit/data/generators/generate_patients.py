@@ -10,15 +10,18 @@ Generates realistic Indian patient data with:
 - Common Indian health conditions
 """
 
-import json
+import os
 import random
 import argparse
-from datetime import datetime, timedelta
-from typing import List, Dict
-from faker import Faker
-
-# Initialize Faker with Indian locale
-fake = Faker(['en_IN', 'hi_IN'])
+from bisect import bisect_right
+from collections import Counter
+from multiprocessing import Pool
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, List, Dict, Optional, Sequence, Tuple
+import numpy as np
+import orjson
 
 # Indian cities with their states and PIN code ranges
 INDIAN_CITIES = [
@@ -70,6 +73,56 @@ INDIAN_SURNAMES = [
     "Kapoor", "Bhatia", "Sinha", "Mishra", "Pandey", "Jain", "Choudhury", "Mukherjee", "Kulkarni", "Naidu",
 ]
 
+# Tuple views of the pools above, built once so random.choice samples them
+# directly instead of converting dict views or lists on every call.
+_REGIONS = tuple(INDIAN_FIRST_NAMES.keys())
+_FIRST_NAMES_BY_REGION = {region: tuple(names) for region, names in INDIAN_FIRST_NAMES.items()}
+_SURNAMES = tuple(INDIAN_SURNAMES)
+_INDIAN_CITIES_TUP = tuple(INDIAN_CITIES)
+_CITIES_BY_NAME = {c['city']: c for c in INDIAN_CITIES}
+
+# Condition.code for each entry of INDIAN_CONDITIONS, shared by reference
+# between every patient with that condition.
+_CONDITION_CODE_BLOCKS = tuple({"coding": [c], "text": c["display"]} for c in INDIAN_CONDITIONS)
+
+_STREET_NAMES = ("MG Road", "Park Street", "Main Road", "Station Road", "Gandhi Nagar",
+                 "Nehru Street", "Commercial Street", "Church Road", "Ring Road", "Sector")
+_BLOOD_GROUPS = ('A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-')
+_GENDERS = ('male', 'female', 'other')
+# Cumulative weights (out of 100) for 0, 1, 2 or 3 conditions, for a bisect
+# lookup on a single random.random() draw.
+_CONDITION_COUNT_CUM_WEIGHTS = (30, 70, 90, 100)
+
+# (street number, street, PIN suffix) triplets drawn once at import from a
+# fixed seed, so an address needs one corpus draw plus one city draw.
+def _build_address_corpus(size: int = 10_000) -> Tuple[Tuple[str, str, str], ...]:
+    rng = np.random.default_rng(0)
+    numbers = rng.integers(1, 1000, size).tolist()
+    streets = rng.integers(0, len(_STREET_NAMES), size).tolist()
+    pins = rng.integers(10, 100, (size, 2)).tolist()
+    return tuple((str(n), _STREET_NAMES[st], f"{p1}{p2}") for n, st, (p1, p2) in zip(numbers, streets, pins))
+
+
+_ADDRESS_CORPUS = _build_address_corpus()
+
+# Valid Indian mobile number prefixes (6, 7, 8, 9)
+_PHONE_PREFIXES = ('6', '7', '8', '9')
+# Patients per worker task; main() holds at most a few chunks at once.
+_PATIENT_CHUNK_SIZE = 2000
+
+# Constant Patient subtrees, shared by reference between every patient record.
+_ABHA_IDENTIFIER_TYPE = {
+    "coding": [{
+        "system": "http://terminology.hl7.org/CodeSystem/v2-0203",
+        "code": "NNIND",
+        "display": "National Person Identifier - India"
+    }],
+    "text": "ABHA Number"
+}
+_PATIENT_META = {"profile": ["https://nrces.in/ndhm/fhir/r4/StructureDefinition/Patient"]}
+_PATIENT_AGE_EXTENSION_URL = "http://hl7.org/fhir/StructureDefinition/patient-age"
+_AGE_UNIT = {"unit": "years", "system": "http://unitsofmeasure.org", "code": "a"}
+
 
 def generate_abha_number() -> str:
     """Generate a realistic ABHA number (14-digit format: XX-XXXX-XXXX-XXXX)."""
@@ -82,17 +135,35 @@ def generate_abha_number() -> str:
 
 def generate_indian_phone() -> str:
     """Generate a realistic Indian phone number (+91-XXXXXXXXXX)."""
-    # Valid Indian mobile number prefixes (6, 7, 8, 9)
-    prefix = random.choice(['6', '7', '8', '9'])
-    rest = ''.join([str(random.randint(0, 9)) for _ in range(9)])
-    return f"+91-{prefix}{rest}"
+    return f"+91-{random.choice(_PHONE_PREFIXES)}{random.randrange(1_000_000_000):09d}"
+
+
+def generate_abha_batch(n: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+    """Generate n ABHA numbers with one vectorized draw per number part."""
+    rng = rng or np.random.default_rng()
+    parts = (
+        rng.integers(10, 100, n).tolist(),
+        rng.integers(1000, 10000, n).tolist(),
+        rng.integers(1000, 10000, n).tolist(),
+        rng.integers(1000, 10000, n).tolist(),
+    )
+    return [f"{a}-{b}-{c}-{d}" for a, b, c, d in zip(*parts)]
+
+
+def generate_phone_batch(n: int, rng: Optional[np.random.Generator] = None) -> List[str]:
+    """Generate n Indian mobile numbers with one vectorized draw for prefixes and one for the rest."""
+    rng = rng or np.random.default_rng()
+    prefixes = rng.integers(0, len(_PHONE_PREFIXES), n).tolist()
+    rests = rng.integers(0, 10 ** 9, n).tolist()
+    return [f"+91-{_PHONE_PREFIXES[p]}{r:09d}" for p, r in zip(prefixes, rests)]
 
 
 def generate_indian_name() -> Dict[str, str]:
     """Generate a realistic Indian name with regional diversity."""
-    region = random.choice(list(INDIAN_FIRST_NAMES.keys()))
-    first_name = random.choice(INDIAN_FIRST_NAMES[region])
-    surname = random.choice(INDIAN_SURNAMES)
+    choice = random.choice
+    region = choice(_REGIONS)
+    first_name = choice(_FIRST_NAMES_BY_REGION[region])
+    surname = choice(_SURNAMES)
 
     return {
         "text": f"{first_name} {surname}",
@@ -103,22 +174,20 @@ def generate_indian_name() -> Dict[str, str]:
 
 def generate_indian_address() -> Dict:
     """Generate a realistic Indian address."""
-    city_data = random.choice(INDIAN_CITIES)
+    choice = random.choice
+    city_data = choice(_INDIAN_CITIES_TUP)
 
     # Generate realistic street address
-    street_number = random.randint(1, 999)
-    street_names = ["MG Road", "Park Street", "Main Road", "Station Road", "Gandhi Nagar",
-                    "Nehru Street", "Commercial Street", "Church Road", "Ring Road", "Sector"]
-    street = random.choice(street_names)
+    street_number, street, pin_suffix = choice(_ADDRESS_CORPUS)
 
     # Generate PIN code based on city
-    pin_code = f"{city_data['pin_prefix']}{random.randint(10, 99)}{random.randint(10, 99)}"
+    pin_code = f"{city_data['pin_prefix']}{pin_suffix}"
 
     return {
         "use": "home",
         "type": "physical",
         "text": f"{street_number}, {street}, {city_data['city']}, {city_data['state']} {pin_code}",
-        "line": [f"{street_number}", street],
+        "line": [street_number, street],
         "city": city_data["city"],
         "state": city_data["state"],
         "postalCode": pin_code,
@@ -126,86 +195,160 @@ def generate_indian_address() -> Dict:
     }
 
 
-def generate_conditions(num_conditions: int = None) -> List[Dict]:
-    """Generate random health conditions common in India."""
-    if num_conditions is None:
+def generate_conditions(num_conditions: int = None,
+                        date_ordinals: Optional[Sequence[Tuple[int, int]]] = None,
+                        indices: Optional[Sequence[int]] = None) -> List[Dict]:
+    """Generate random health conditions common in India.
+
+    date_ordinals holds pre-drawn (onset, recorded) date ordinals, one pair
+    per condition, and indices pre-drawn distinct INDIAN_CONDITIONS indices;
+    both are drawn here when omitted.
+    """
+    if indices is not None:
+        num_conditions = len(indices)
+    elif num_conditions is None:
         # Most patients have 0-3 conditions
-        num_conditions = random.choices([0, 1, 2, 3], weights=[30, 40, 20, 10])[0]
+        num_conditions = bisect_right(_CONDITION_COUNT_CUM_WEIGHTS, random.random() * 100)
 
     if num_conditions == 0:
         return []
 
-    selected = random.sample(INDIAN_CONDITIONS, min(num_conditions, len(INDIAN_CONDITIONS)))
+    selected = indices if indices is not None else \
+        random.sample(range(len(INDIAN_CONDITIONS)), min(num_conditions, len(INDIAN_CONDITIONS)))
+
+    if date_ordinals is None:
+        today_ord = date.today().toordinal()
+        date_ordinals = []
+        for _ in selected:
+            # Onset within the last 10 years, recorded between onset and today
+            onset_ord = today_ord - random.randint(0, 3650)
+            date_ordinals.append((onset_ord, random.randint(onset_ord, today_ord)))
 
     conditions = []
-    for cond in selected:
-        onset_date = fake.date_between(start_date='-10y', end_date='today')
+    for i, (onset_ord, recorded_ord) in zip(selected, date_ordinals):
         conditions.append({
-            "code": {
-                "coding": [cond],
-                "text": cond["display"]
-            },
-            "onsetDateTime": onset_date.isoformat(),
-            "recordedDate": fake.date_between(start_date=onset_date, end_date='today').isoformat()
+            "code": _CONDITION_CODE_BLOCKS[i],
+            "onsetDateTime": date.fromordinal(onset_ord).isoformat(),
+            "recordedDate": date.fromordinal(recorded_ord).isoformat()
         })
 
     return conditions
 
 
-def generate_patient() -> Dict:
-    """Generate a complete patient record with Indian context."""
+def _age_on(birth_date: date, today: date) -> int:
+    """Age in whole years on today."""
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+@dataclass(slots=True)
+class PatientRecord:
+    """A generated patient, held without a per-instance __dict__.
+
+    Field names are the Patient JSON keys, in output order, so orjson
+    serializes a record directly without building an intermediate dict.
+    """
+
+    resourceType: str
+    id: str
+    identifier: List[Dict]
+    active: bool
+    name: List[Dict]
+    telecom: List[Dict]
+    gender: str
+    birthDate: str
+    address: List[Dict]
+    meta: Dict
+    extension: List[Dict]
+    # Blood group as a custom extension (common in Indian health records)
+    bloodGroup: str
+    conditions: List[Dict]
+    createdAt: str
+    abha_number: str
+
+    def to_dict(self) -> Dict:
+        """Return the record as a plain Patient dict (subtrees are shared, not copied)."""
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+def generate_patient(*args, **kwargs) -> Dict:
+    """Generate a complete patient record as a plain dict; see generate_patient_record."""
+    return generate_patient_record(*args, **kwargs).to_dict()
+
+
+def generate_patient_record(birth_date: Optional[date] = None,
+                            condition_date_ordinals: Optional[Sequence[Tuple[int, int]]] = None,
+                            abha_number: Optional[str] = None,
+                            phone: Optional[str] = None,
+                            gender: Optional[str] = None,
+                            name: Optional[Dict] = None,
+                            address: Optional[Dict] = None,
+                            blood_group: Optional[str] = None,
+                            condition_indices: Optional[Sequence[int]] = None,
+                            created_at: Optional[str] = None) -> PatientRecord:
+    """Generate a complete patient record with Indian context.
+
+    birth_date, condition_date_ordinals (up to three (onset, recorded)
+    ordinal pairs), abha_number, phone, gender, name, address, blood_group
+    and condition_indices (already sized for the patient's age) may be
+    pre-drawn in bulk; they are drawn here when omitted. created_at lets a
+    batch share one timestamp string instead of reading the clock per record.
+    """
+
+    choice, randint = random.choice, random.randint
 
     # Generate basic demographics
-    gender = random.choice(['male', 'female', 'other'])
-    birth_date = fake.date_of_birth(minimum_age=18, maximum_age=85)
+    if gender is None:
+        gender = choice(_GENDERS)
+    if birth_date is None:
+        # Adults aged 18-85
+        birth_date = date.fromordinal(date.today().toordinal() - randint(18 * 365, 85 * 365))
 
     # Calculate age
-    today = datetime.now().date()
-    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+    age = _age_on(birth_date, datetime.now().date())
 
     # Generate identifiers
-    abha_number = generate_abha_number()
+    if abha_number is None:
+        abha_number = generate_abha_number()
 
     # Generate contact info
-    name = generate_indian_name()
-    phone = generate_indian_phone()
+    if name is None:
+        name = generate_indian_name()
+    if phone is None:
+        phone = generate_indian_phone()
     email = f"{name['given'][0].lower()}.{name['family'].lower()}@example.com"
 
     # Generate address
-    address = generate_indian_address()
+    if address is None:
+        address = generate_indian_address()
 
     # Generate conditions based on age
-    if age > 50:
-        conditions = generate_conditions(random.randint(1, 3))
+    if condition_indices is not None:
+        conditions = generate_conditions(date_ordinals=condition_date_ordinals, indices=condition_indices)
+    elif age > 50:
+        conditions = generate_conditions(randint(1, 3), condition_date_ordinals)
     elif age > 30:
-        conditions = generate_conditions(random.randint(0, 2))
+        conditions = generate_conditions(randint(0, 2), condition_date_ordinals)
     else:
-        conditions = generate_conditions(random.randint(0, 1))
+        conditions = generate_conditions(randint(0, 1), condition_date_ordinals)
 
     # Generate blood group
-    blood_group = random.choice(['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-'])
+    if blood_group is None:
+        blood_group = choice(_BLOOD_GROUPS)
 
-    patient = {
-        "resourceType": "Patient",
-        "id": abha_number.replace('-', ''),
-        "identifier": [
+    return PatientRecord(
+        resourceType="Patient",
+        id=abha_number.replace('-', ''),
+        identifier=[
             {
                 "use": "official",
-                "type": {
-                    "coding": [{
-                        "system": "http://terminology.hl7.org/CodeSystem/v2-0203",
-                        "code": "NNIND",
-                        "display": "National Person Identifier - India"
-                    }],
-                    "text": "ABHA Number"
-                },
+                "type": _ABHA_IDENTIFIER_TYPE,
                 "system": "https://healthid.ndhm.gov.in",
                 "value": abha_number
             }
         ],
-        "active": True,
-        "name": [name],
-        "telecom": [
+        active=True,
+        name=[name],
+        telecom=[
             {
                 "system": "phone",
                 "value": phone,
@@ -217,31 +360,21 @@ def generate_patient() -> Dict:
                 "use": "home"
             }
         ],
-        "gender": gender,
-        "birthDate": birth_date.isoformat(),
-        "address": [address],
-        "meta": {
-            "profile": ["https://nrces.in/ndhm/fhir/r4/StructureDefinition/Patient"]
-        },
-        "extension": [
+        gender=gender,
+        birthDate=birth_date.isoformat(),
+        address=[address],
+        meta=_PATIENT_META,
+        extension=[
             {
-                "url": "http://hl7.org/fhir/StructureDefinition/patient-age",
-                "valueAge": {
-                    "value": age,
-                    "unit": "years",
-                    "system": "http://unitsofmeasure.org",
-                    "code": "a"
-                }
+                "url": _PATIENT_AGE_EXTENSION_URL,
+                "valueAge": {"value": age, **_AGE_UNIT},
             }
         ],
-        # Add blood group as a custom extension (common in Indian health records)
-        "bloodGroup": blood_group,
-        "conditions": conditions,
-        "createdAt": datetime.now().isoformat(),
-        "abha_number": abha_number
-    }
-
-    return patient
+        bloodGroup=blood_group,
+        conditions=conditions,
+        createdAt=created_at or datetime.now().isoformat(),
+        abha_number=abha_number,
+    )
 
 
 def generate_practitioners(count: int = 10) -> List[Dict]:
@@ -343,7 +476,7 @@ def generate_organizations(count: int = 5) -> List[Dict]:
 
     for i, hospital in enumerate(hospitals[:count]):
         # Find matching city data
-        city_data = next((c for c in INDIAN_CITIES if c['city'] == hospital['city']), INDIAN_CITIES[0])
+        city_data = _CITIES_BY_NAME.get(hospital['city'], INDIAN_CITIES[0])
 
         org_id = f"org-{i+1:03d}"
 
@@ -397,17 +530,177 @@ def generate_organizations(count: int = 5) -> List[Dict]:
     return organizations
 
 
+def draw_patient_dates(rng: np.random.Generator, n: int) -> Tuple[List[date], List[List[Tuple[int, int]]]]:
+    """Pre-draw birth dates and condition date ordinals for n patients in bulk.
+
+    Returns the birth dates (ages 18-85) and, per patient, three (onset,
+    recorded) ordinal pairs: onset within the last 10 years, recorded
+    between onset and today.
+    """
+    today_ord = date.today().toordinal()
+    birth_ordinals = today_ord - rng.integers(18 * 365, 85 * 365, size=n)
+    onset_offsets = rng.integers(0, 3650, size=(n, 3))
+    recorded_offsets = rng.integers(0, onset_offsets + 1)
+    onset_ordinals = (today_ord - onset_offsets).tolist()
+    recorded_ordinals = (today_ord - recorded_offsets).tolist()
+
+    birth_dates = [date.fromordinal(o) for o in birth_ordinals.tolist()]
+    condition_dates = [list(zip(onsets, recorded)) for onsets, recorded in zip(onset_ordinals, recorded_ordinals)]
+    return birth_dates, condition_dates
+
+
+def generate_name_batch(n: int, rng: Optional[np.random.Generator] = None) -> List[Dict[str, str]]:
+    """Generate n names with one vectorized draw each for region, first name and surname."""
+    rng = rng or np.random.default_rng()
+    region_idx = rng.integers(0, len(_REGIONS), n)
+    pool_sizes = np.array([len(_FIRST_NAMES_BY_REGION[r]) for r in _REGIONS])
+    first_idx = rng.integers(0, pool_sizes[region_idx]).tolist()
+    surname_idx = rng.integers(0, len(_SURNAMES), n).tolist()
+    names = []
+    for r, f, s in zip(region_idx.tolist(), first_idx, surname_idx):
+        first_name, surname = _FIRST_NAMES_BY_REGION[_REGIONS[r]][f], _SURNAMES[s]
+        names.append({"text": f"{first_name} {surname}", "given": [first_name], "family": surname})
+    return names
+
+
+def generate_address_batch(n: int, rng: Optional[np.random.Generator] = None) -> List[Dict]:
+    """Generate n home addresses with one vectorized draw each for city and street corpus entry."""
+    rng = rng or np.random.default_rng()
+    city_idx = rng.integers(0, len(_INDIAN_CITIES_TUP), n).tolist()
+    corpus_idx = rng.integers(0, len(_ADDRESS_CORPUS), n).tolist()
+    addresses = []
+    for c, a in zip(city_idx, corpus_idx):
+        city_data = _INDIAN_CITIES_TUP[c]
+        street_number, street, pin_suffix = _ADDRESS_CORPUS[a]
+        pin_code = f"{city_data['pin_prefix']}{pin_suffix}"
+        addresses.append({
+            "use": "home",
+            "type": "physical",
+            "text": f"{street_number}, {street}, {city_data['city']}, {city_data['state']} {pin_code}",
+            "line": [street_number, street],
+            "city": city_data["city"],
+            "state": city_data["state"],
+            "postalCode": pin_code,
+            "country": "IN"
+        })
+    return addresses
+
+
+def draw_condition_indices(rng: np.random.Generator, birth_dates: Sequence[date]) -> List[List[int]]:
+    """Pre-draw distinct INDIAN_CONDITIONS indices per patient, sized by age.
+
+    Patients over 50 get 1-3 conditions, over 30 get 0-2 and the rest 0-1,
+    matching generate_patient's own draw.
+    """
+    n = len(birth_dates)
+    today = date.today()
+    ages = np.array([_age_on(b, today) for b in birth_dates], dtype=np.int64)
+    low = np.where(ages > 50, 1, 0)
+    high = np.where(ages > 50, 3, np.where(ages > 30, 2, 1))
+    counts = rng.integers(low, high + 1).tolist()
+    # Ranking a uniform row yields a sample without replacement per patient
+    picks = rng.random((n, len(INDIAN_CONDITIONS))).argsort(axis=1)[:, :3].tolist()
+    return [row[:k] for row, k in zip(picks, counts)]
+
+
+def _generate_patient_chunk(task: Tuple[int, np.random.SeedSequence]) -> List[PatientRecord]:
+    """Generate one shard of patients in a worker process from its own seed sequence.
+
+    Every random field is drawn up front from one PCG64 generator, so the
+    per-patient loop only indexes the pre-drawn lists.
+    """
+    count, seed_seq = task
+    random.seed(int(seed_seq.generate_state(1)[0]))
+    rng = np.random.default_rng(seed_seq)
+    birth_dates, condition_dates = draw_patient_dates(rng, count)
+    abha_numbers = generate_abha_batch(count, rng)
+    phones = generate_phone_batch(count, rng)
+    genders = [_GENDERS[i] for i in rng.integers(0, len(_GENDERS), count).tolist()]
+    names = generate_name_batch(count, rng)
+    addresses = generate_address_batch(count, rng)
+    blood_groups = [_BLOOD_GROUPS[i] for i in rng.integers(0, len(_BLOOD_GROUPS), count).tolist()]
+    condition_indices = draw_condition_indices(rng, birth_dates)
+    created_at = datetime.now().isoformat()
+    return [
+        generate_patient_record(birth_dates[i], condition_dates[i], abha_numbers[i], phones[i],
+                                genders[i], names[i], addresses[i], blood_groups[i], condition_indices[i],
+                                created_at)
+        for i in range(count)
+    ]
+
+
+def save_json(filepath: str, data: Any, pretty: bool = False) -> None:
+    """Write data to filepath as JSON (compact unless pretty)."""
+    option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if pretty else 0)
+    Path(filepath).write_bytes(orjson.dumps(data, option=option))
+
+
+def stream_patients(filepath: str, chunks: Iterable[List[PatientRecord]],
+                    pretty: bool = False, ndjson: bool = False) -> Tuple[int, Counter, Counter]:
+    """Write patient chunks to filepath as they arrive, never holding more than one chunk.
+
+    Writes a JSON array (the same bytes save_json would produce) or, with
+    ndjson, one record per line. Returns the patient count and the gender
+    and condition Counters gathered on the way through.
+    """
+    gender_counts: Counter = Counter()
+    condition_counts: Counter = Counter()
+    count = 0
+    if ndjson:
+        option, head, sep, tail = orjson.OPT_APPEND_NEWLINE, b"", b"", b""
+    elif pretty:
+        option, head, sep, tail = orjson.OPT_INDENT_2, b"[\n  ", b",\n  ", b"\n]\n"
+    else:
+        option, head, sep, tail = 0, b"[", b",", b"]\n"
+
+    with open(filepath, 'wb') as f:
+        write = f.write
+        for chunk in chunks:
+            for record in chunk:
+                blob = orjson.dumps(record, option=option)
+                if pretty and not ndjson:
+                    # Nest the record one level deeper, as inside an indented array
+                    blob = blob.replace(b"\n", b"\n  ")
+                write(sep if count else head)
+                write(blob)
+                count += 1
+                gender_counts[record.gender] += 1
+                condition_counts.update(c['code']['text'] for c in record.conditions)
+        write(tail if count else (b"" if ndjson else b"[]\n"))
+    return count, gender_counts, condition_counts
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate Indian patient data for ABDM Local Dev Kit')
     parser.add_argument('--patients', type=int, default=100, help='Number of patients to generate')
     parser.add_argument('--practitioners', type=int, default=10, help='Number of practitioners to generate')
     parser.add_argument('--organizations', type=int, default=5, help='Number of organizations to generate')
     parser.add_argument('--output-dir', type=str, default='data/seed', help='Output directory for generated data')
+    parser.add_argument('--pretty', action='store_true', help='Indent JSON output for reading')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible output')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for patient generation (default: CPU count)')
+    parser.add_argument('--ndjson', action='store_true', help='Write patients as newline-delimited JSON (patients.ndjson)')
 
     args = parser.parse_args()
+    random.seed(args.seed)
+
+    os.makedirs(args.output_dir, exist_ok=True)
 
     print(f"Generating {args.patients} Indian patient records...")
-    patients = [generate_patient() for _ in range(args.patients)]
+    # Fixed-size shards bound memory to a few chunks in flight and make the
+    # output independent of --workers for a given --seed.
+    chunk_sizes = [min(_PATIENT_CHUNK_SIZE, args.patients - start)
+                   for start in range(0, args.patients, _PATIENT_CHUNK_SIZE)]
+    chunk_seeds = np.random.SeedSequence(args.seed).spawn(len(chunk_sizes))
+    n_workers = max(1, min(args.workers or os.cpu_count() or 1, len(chunk_sizes)))
+    patients_file = f"{args.output_dir}/patients.{'ndjson' if args.ndjson else 'json'}"
+    with Pool(n_workers) as pool:
+        # imap (not imap_unordered) keeps the output order, and so the
+        # output itself, reproducible for a given --seed.
+        num_patients, gender_counts, condition_counts = stream_patients(
+            patients_file, pool.imap(_generate_patient_chunk, zip(chunk_sizes, chunk_seeds)),
+            args.pretty, args.ndjson)
+    print(f"✅ Saved {num_patients} patients to {patients_file}")
 
     print(f"Generating {args.practitioners} practitioner records...")
     practitioners = generate_practitioners(args.practitioners)
@@ -416,43 +709,27 @@ def main():
     organizations = generate_organizations(args.organizations)
 
     # Save to JSON files
-    import os
-    os.makedirs(args.output_dir, exist_ok=True)
-
-    patients_file = f"{args.output_dir}/patients.json"
-    with open(patients_file, 'w', encoding='utf-8') as f:
-        json.dump(patients, f, indent=2, ensure_ascii=False)
-    print(f"✅ Saved {len(patients)} patients to {patients_file}")
-
     practitioners_file = f"{args.output_dir}/practitioners.json"
-    with open(practitioners_file, 'w', encoding='utf-8') as f:
-        json.dump(practitioners, f, indent=2, ensure_ascii=False)
+    save_json(practitioners_file, practitioners, args.pretty)
     print(f"✅ Saved {len(practitioners)} practitioners to {practitioners_file}")
 
     organizations_file = f"{args.output_dir}/organizations.json"
-    with open(organizations_file, 'w', encoding='utf-8') as f:
-        json.dump(organizations, f, indent=2, ensure_ascii=False)
+    save_json(organizations_file, organizations, args.pretty)
     print(f"✅ Saved {len(organizations)} organizations to {organizations_file}")
 
     # Print summary statistics
     print("\n" + "="*50)
     print("GENERATION SUMMARY")
     print("="*50)
-    print(f"Total Patients: {len(patients)}")
-    print(f"  - Male: {sum(1 for p in patients if p['gender'] == 'male')}")
-    print(f"  - Female: {sum(1 for p in patients if p['gender'] == 'female')}")
-    print(f"  - Other: {sum(1 for p in patients if p['gender'] == 'other')}")
+    print(f"Total Patients: {num_patients}")
+    print(f"  - Male: {gender_counts['male']}")
+    print(f"  - Female: {gender_counts['female']}")
+    print(f"  - Other: {gender_counts['other']}")
     print(f"\nTotal Practitioners: {len(practitioners)}")
     print(f"Total Organizations: {len(organizations)}")
 
     # Condition statistics
-    all_conditions = []
-    for p in patients:
-        all_conditions.extend([c['code']['text'] for c in p.get('conditions', [])])
-
-    if all_conditions:
-        from collections import Counter
-        condition_counts = Counter(all_conditions)
+    if condition_counts:
         print(f"\nTop 5 Health Conditions:")
         for condition, count in condition_counts.most_common(5):
             print(f"  - {condition}: {count} patients")
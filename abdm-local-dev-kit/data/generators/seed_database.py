@@ -6,32 +6,85 @@ Seeds MongoDB with generated patient, practitioner, organization data,
 and sample FHIR bundles.
 """
 
-import json
 import os
 import argparse
+from itertools import islice
+from pathlib import Path
 from pymongo import MongoClient
 from datetime import datetime
+import orjson
 
 
 def load_json_file(filepath: str):
     """Load JSON data from file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def load_bundles_from_directory(directory: str):
-    """Load all JSON bundles from a directory."""
-    bundles = []
-    if not os.path.exists(directory):
-        return bundles
-
-    for filename in os.listdir(directory):
-        if filename.endswith('.json'):
-            filepath = os.path.join(directory, filename)
-            bundle = load_json_file(filepath)
-            bundles.append(bundle)
-
-    return bundles
+    return orjson.loads(Path(filepath).read_bytes())
+
+
+def iter_json_lines(filepath: str):
+    """Yield one document per non-blank line of a JSON Lines file."""
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def _find_patient_abha(bundle: dict):
+    """Return the ABHA identifier value of the bundle's Patient entry, if any."""
+    get = dict.get
+    for entry in get(bundle, 'entry') or ():
+        resource = get(entry, 'resource')
+        if resource and get(resource, 'resourceType') == 'Patient':
+            for identifier in get(resource, 'identifier') or ():
+                if 'healthid.ndhm.gov.in' in get(identifier, 'system', ''):
+                    return get(identifier, 'value')
+    return None
+
+
+def decorate_bundle(bundle: dict, bundle_type: str) -> dict:
+    """Add the top-level fields MongoDB indexes bundles by."""
+    # Map FHIR Bundle.id to bundle_id for MongoDB indexing
+    bundle['bundle_id'] = bundle.get('id')
+    bundle['bundle_type'] = bundle_type
+    bundle['created_at'] = datetime.now().isoformat()
+
+    # Extract patient ABHA for easier querying
+    abha = _find_patient_abha(bundle)
+    if abha is not None:
+        bundle['patient_abha'] = abha
+    return bundle
+
+
+def iter_bundles(directory: str, bundle_type: str):
+    """Yield decorated bundles one at a time.
+
+    Reads <BundleType>/*.json files and, next to that directory, the
+    <BundleType>.jsonl file written by generate_bundles.py --format jsonl.
+    """
+    if os.path.exists(directory):
+        with os.scandir(directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith('.json'):
+                    yield decorate_bundle(load_json_file(dir_entry.path), bundle_type)
+
+    jsonl_file = f"{directory}.jsonl"
+    if os.path.exists(jsonl_file):
+        for bundle in iter_json_lines(jsonl_file):
+            yield decorate_bundle(bundle, bundle_type)
+
+
+def bulk_insert(collection, docs, batch_size: int = 1000) -> int:
+    """Insert docs in unordered batches so no single command nears the 16MB BSON limit.
+
+    docs may be any iterable; only one batch is held in memory at a time.
+    """
+    inserted = 0
+    docs = iter(docs)
+    while True:
+        batch = list(islice(docs, batch_size))
+        if not batch:
+            return inserted
+        result = collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+        inserted += len(result.inserted_ids)
 
 
 def seed_database(mongo_uri: str, database_name: str, data_dir: str, bundle_dir: str):
@@ -49,15 +102,23 @@ def seed_database(mongo_uri: str, database_name: str, data_dir: str, bundle_dir:
         if count > 0:
             db[collection_name].delete_many({})
             print(f"  ✅ Cleared {count} documents from {collection_name}")
+        # Drop secondary indexes so the bulk load below does no per-document
+        # index maintenance; they are rebuilt once after all inserts.
+        db[collection_name].drop_indexes()
 
     # Load and seed patients
     print("\nSeeding patients...")
     patients_file = os.path.join(data_dir, 'patients.json')
+    patients_ndjson = os.path.join(data_dir, 'patients.ndjson')
     if os.path.exists(patients_file):
         patients = load_json_file(patients_file)
         if patients:
-            result = db.patients.insert_many(patients)
-            print(f"  ✅ Inserted {len(result.inserted_ids)} patients")
+            inserted = bulk_insert(db.patients, patients)
+            print(f"  ✅ Inserted {inserted} patients")
+    elif os.path.exists(patients_ndjson):
+        # Written by generate_patients.py --ndjson; streamed line by line
+        inserted = bulk_insert(db.patients, iter_json_lines(patients_ndjson))
+        print(f"  ✅ Inserted {inserted} patients")
     else:
         print(f"  ⚠️  Patients file not found: {patients_file}")
 
@@ -67,8 +128,8 @@ def seed_database(mongo_uri: str, database_name: str, data_dir: str, bundle_dir:
     if os.path.exists(practitioners_file):
         practitioners = load_json_file(practitioners_file)
         if practitioners:
-            result = db.practitioners.insert_many(practitioners)
-            print(f"  ✅ Inserted {len(result.inserted_ids)} practitioners")
+            inserted = bulk_insert(db.practitioners, practitioners)
+            print(f"  ✅ Inserted {inserted} practitioners")
     else:
         print(f"  ⚠️  Practitioners file not found: {practitioners_file}")
 
@@ -78,8 +139,8 @@ def seed_database(mongo_uri: str, database_name: str, data_dir: str, bundle_dir:
     if os.path.exists(organizations_file):
         organizations = load_json_file(organizations_file)
         if organizations:
-            result = db.organizations.insert_many(organizations)
-            print(f"  ✅ Inserted {len(result.inserted_ids)} organizations")
+            inserted = bulk_insert(db.organizations, organizations)
+            print(f"  ✅ Inserted {inserted} organizations")
     else:
         print(f"  ⚠️  Organizations file not found: {organizations_file}")
 
@@ -90,30 +151,15 @@ def seed_database(mongo_uri: str, database_name: str, data_dir: str, bundle_dir:
     total_bundles = 0
     for bundle_type in bundle_types:
         type_dir = os.path.join(bundle_dir, bundle_type)
-        bundles = load_bundles_from_directory(type_dir)
-
-        if bundles:
-            # Add metadata for indexing
-            for bundle in bundles:
-                # Map FHIR Bundle.id to bundle_id for MongoDB indexing
-                bundle['bundle_id'] = bundle.get('id')
-                bundle['bundle_type'] = bundle_type
-                bundle['created_at'] = datetime.now().isoformat()
-
-                # Extract patient ABHA for easier querying
-                for entry in bundle.get('entry', []):
-                    resource = entry.get('resource', {})
-                    if resource.get('resourceType') == 'Patient':
-                        for identifier in resource.get('identifier', []):
-                            if 'healthid.ndhm.gov.in' in identifier.get('system', ''):
-                                bundle['patient_abha'] = identifier.get('value')
-                                break
-
-            result = db.health_information_bundles.insert_many(bundles)
-            print(f"  ✅ Inserted {len(result.inserted_ids)} {bundle_type} bundles")
-            total_bundles += len(result.inserted_ids)
+        # Bundles are parsed, decorated and inserted 500 at a time so memory
+        # stays bounded and inserts start before every file has been read.
+        inserted = bulk_insert(db.health_information_bundles, iter_bundles(type_dir, bundle_type), batch_size=500)
+
+        if inserted:
+            print(f"  ✅ Inserted {inserted} {bundle_type} bundles")
+            total_bundles += inserted
         else:
-            print(f"  ⚠️  No bundles found in {type_dir}")
+            print(f"  ⚠️  No bundles found in {type_dir} or {type_dir}.jsonl")
 
     # Create indexes for better query performance
     print("\nCreating indexes...")
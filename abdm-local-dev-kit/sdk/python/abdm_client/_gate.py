@@ -0,0 +1,95 @@
+"""
+Adaptive concurrency gate
+
+Caps how many gateway requests one client has in flight, growing the cap
+while the gateway keeps up and cutting it back when it slows down or
+starts rejecting requests.
+"""
+
+import asyncio
+from time import monotonic
+from typing import Optional
+
+
+class AIMDGate:
+    """
+    Additive-increase / multiplicative-decrease admission gate.
+
+    Each response that meets the latency target grows the limit by about
+    alpha per window of in-flight requests. A slow response, a 429, a 5xx
+    or a transport failure scales it by beta, at most once per
+    target_latency_ms so one bad burst does not collapse it. The last three
+    also hold new requests back for cooldown seconds (circuit open) so the
+    next burst does not stampede an overloaded gateway.
+
+    Usage:
+        async with gate:
+            started = monotonic()
+            response = await send()
+            gate.record((monotonic() - started) * 1000, response.status_code)
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        target_latency_ms: float = 2000.0,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        cooldown: float = 1.0
+    ):
+        self.limit = float(initial)
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency_ms = target_latency_ms
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._open_until = 0.0
+        self._last_decrease = 0.0
+
+    async def __aenter__(self):
+        async with self._cond:
+            while True:
+                delay = self._open_until - monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    await self._cond.wait()
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._cond:
+            self.in_flight -= 1
+            # Wake everyone who fits under the (possibly raised) limit
+            self._cond.notify(max(1, int(self.limit) - self.in_flight))
+
+    def record(self, latency_ms: float, status: Optional[int]) -> None:
+        """
+        Feed one completed request back into the limit.
+
+        Args:
+            latency_ms: Time from send to fully read response
+            status: HTTP status code, or None if the request failed in transport
+        """
+        now = monotonic()
+        overloaded = status is None or status == 429 or status >= 500
+
+        if overloaded:
+            self._open_until = now + self.cooldown
+        elif latency_ms <= self.target_latency_ms:
+            self.limit = min(self.max_limit, self.limit + self.alpha / self.limit)
+            return
+
+        if now - self._last_decrease >= self.target_latency_ms / 1000:
+            self.limit = max(self.min_limit, self.limit * self.beta)
+            self._last_decrease = now
@@ -0,0 +1,57 @@
+"""
+Request payload validators
+
+Compiles JSON Schema definitions for SDK method arguments into plain
+Python functions once at import time.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaValueException
+
+from .exceptions import ValidationError
+
+NON_EMPTY_STRING = {"type": "string", "minLength": 1}
+
+
+def _error_message(e: JsonSchemaValueException, path: str) -> str:
+    """Phrase a schema violation in terms of the argument it is about."""
+    if e.rule == "required":
+        missing = next(f for f in e.rule_definition if f not in e.value)
+        return f"{path} missing required field '{missing}'"
+    if e.rule == "minLength" or (e.rule == "type" and e.value in (None, "")):
+        return f"{path} is required"
+    if e.rule == "minItems":
+        return f"{path} must not be empty"
+    # fastjsonschema messages start with the instance path, e.g. "data.x must be string"
+    return path + e.message[len(e.name):]
+
+
+def compile_validator(schema: Dict[str, Any], name: Optional[str] = None) -> Callable[[Any], Any]:
+    """
+    Compile a JSON Schema into a checker that raises ValidationError.
+
+    fastjsonschema generates straight-line Python for the schema, so a
+    call costs about the same as the equivalent hand-written if-checks.
+
+    Args:
+        schema: JSON Schema for the payload
+        name: Argument name the payload was passed as. Leave unset when the
+            payload is a dict of the method's arguments keyed by their names.
+    """
+    validate = fastjsonschema.compile(schema)
+
+    def check(payload: Any) -> Any:
+        try:
+            return validate(payload)
+        except JsonSchemaValueException as e:
+            # e.name is the instance path rooted at "data"
+            rest = e.name[len("data"):]
+            path = name + rest if name else rest.lstrip(".")
+            raise ValidationError(
+                _error_message(e, path),
+                details={"path": path, "rule": e.rule}
+            ) from None
+
+    return check
@@ -2,14 +2,22 @@
 ABDM Client - Main client class with schema validation
 """
 
+import asyncio
+import functools
+import os
+import fastjsonschema
 import httpx
-import yaml
+import orjson
+from fastjsonschema import JsonSchemaValueException
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from time import monotonic
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from uuid import uuid4
-from openapi_spec_validator import validate
-from openapi_spec_validator.readers import read_from_filename
+
+# yaml, openapi_spec_validator and openapi_schema_validator are imported
+# lazily in the schema loaders below, so clients created with
+# validate_schemas=False (or served from the JSON sidecar) never load them.
 
 from .exceptions import (
     ABDMError,
@@ -22,12 +30,146 @@ from .exceptions import (
     NetworkError,
     TimeoutError
 )
+from ._gate import AIMDGate
 from .discovery import DiscoveryClient
 from .linking import LinkingClient
 from .consent import ConsentClient
 from .health_information import HealthInformationClient
 from .hip_callbacks import HIPCallbacksClient
 
+_JSON_HEADERS = {"content-type": "application/json"}
+# datetime values in request bodies serialise as RFC 3339 UTC with a "Z"
+# suffix; naive ones are taken to already be in UTC.
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+
+@functools.lru_cache(maxsize=8)
+def _load_schema_cached(abs_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Load and validate a gateway schema once per process.
+
+    Keyed by the resolved path and its mtime so an edited file is reloaded.
+    The returned dict is shared by every client using that file and must be
+    treated as read-only. Set ABDM_VALIDATE_SPEC=1 to validate the YAML as
+    OpenAPI when it is (re)parsed; a fresh JSON sidecar is trusted as is.
+    """
+    # A JSON sidecar newer than the YAML holds a previous parse of it, which
+    # loads far faster than YAML. It is only validated if ABDM_VALIDATE_SPEC
+    # was set when it was written.
+    cache_path = Path(abs_path + ".cache.json")
+    try:
+        cache_fresh = cache_path.stat().st_mtime_ns >= mtime_ns
+    except OSError:
+        cache_fresh = False
+
+    if cache_fresh:
+        try:
+            return orjson.loads(cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            pass  # Unreadable or corrupt sidecar: re-parse the YAML and rewrite it
+
+    import yaml
+
+    # libyaml's C loader when PyYAML was built against it, else the pure-Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(abs_path, 'r') as f:
+        schema = yaml.load(f, Loader=loader)
+
+    # Validating the spec against the OpenAPI meta-schema is slow and the
+    # shipped spec does not change, so it only runs when asked for.
+    if os.environ.get("ABDM_VALIDATE_SPEC", "0") == "1":
+        from openapi_spec_validator import validate
+
+        try:
+            validate(schema)
+        except Exception as e:
+            raise ValidationError(f"Invalid OpenAPI schema: {str(e)}")
+
+    # Write to a temp file and rename it into place, so a concurrent reader
+    # or a failed write never leaves a truncated sidecar behind
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(orjson.dumps(schema))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        # Read-only install or non-JSON YAML values: just skip caching
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+    return schema
+
+
+class _CompiledValidator:
+    """
+    fastjsonschema-compiled response validator.
+
+    The happy path runs Python generated for the one schema. fastjsonschema
+    stops at the first violation, so the error report is built by
+    OAS30Validator, which is only loaded once a response actually fails.
+    """
+
+    __slots__ = ("_check", "_schema")
+
+    def __init__(self, schema: Dict[str, Any]):
+        # use_default=False: never write schema defaults into the response
+        self._check = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+        self._schema = schema
+
+    def is_valid(self, instance: Any) -> bool:
+        try:
+            self._check(instance)
+        except JsonSchemaValueException:
+            return False
+        return True
+
+    def iter_errors(self, instance: Any):
+        from openapi_schema_validator import OAS30Validator
+        return OAS30Validator(self._schema).iter_errors(instance)
+
+
+@functools.lru_cache(maxsize=1)
+def _validator_factory():
+    """
+    Pick the response validator class once per process.
+
+    Uses jsonschema-rs (the "fast" extra) when installed, which validates in
+    Rust; otherwise compiles the schema to Python with fastjsonschema.
+    """
+    try:
+        from jsonschema_rs import Draft4Validator
+
+        # OAS 3.0 schema objects are a Draft 4 dialect; formats were never
+        # enforced by the OAS30Validator path either.
+        return functools.partial(Draft4Validator, validate_formats=False)
+    except ImportError:
+        return _CompiledValidator
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator(abs_path: str, mtime_ns: int, schema_ref: str) -> Optional[Any]:
+    """
+    Compile the validator for one components/schemas entry, once per process.
+
+    Compiling lazily means a client only pays for the handful of schemas it
+    actually validates against, not all of gateway.yaml. The validator's root
+    carries the spec's components so local "#/components/schemas/..." refs
+    resolve without a separate resolver. Returns None for unknown names.
+    """
+    components = _load_schema_cached(abs_path, mtime_ns).get("components", {})
+    if schema_ref not in components.get("schemas", {}):
+        return None
+    return _validator_factory()({"$ref": f"#/components/schemas/{schema_ref}", "components": components})
+
+
+def _error_path(error: Any) -> str:
+    """Slash-joined instance path of a jsonschema or jsonschema-rs error."""
+    path = getattr(error, "instance_path", None)
+    if path is None:
+        path = error.absolute_path
+    return "/".join(map(str, path))
+
 
 class ABDMClient:
     """
@@ -43,6 +185,8 @@ class ABDMClient:
         timeout: Request timeout in seconds (default: 30)
         validate_schemas: Enable schema validation (default: True)
         schema_path: Path to official gateway.yaml (auto-detected if None)
+        adaptive_concurrency: Limit in-flight requests with an AIMD gate that
+            backs off on slow, 429 and 5xx responses (default: False)
 
     Example:
         >>> client = ABDMClient(
@@ -65,7 +209,8 @@ class ABDMClient:
         client_secret: str = None,
         timeout: int = 30,
         validate_schemas: bool = True,
-        schema_path: Optional[str] = None
+        schema_path: Optional[str] = None,
+        adaptive_concurrency: bool = False
     ):
         self.base_url = base_url.rstrip("/")
         self.client_id = client_id
@@ -73,17 +218,30 @@ class ABDMClient:
         self.timeout = timeout
         self.validate_schemas = validate_schemas
 
-        # HTTP client
+        # HTTP client: one pooled client per ABDMClient, sized for many
+        # concurrent gateway calls. HTTP/2 is negotiated over TLS when the
+        # gateway supports it (plain http:// stays on HTTP/1.1).
         self.http_client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=self.timeout
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=200,
+                keepalive_expiry=30.0
+            )
         )
+        self._gate = AIMDGate() if adaptive_concurrency else None
 
         # Load official ABDM schema for validation
         self.schema = None
+        self._schema_key: Optional[tuple] = None
+        self._validators: Dict[str, Any] = {}
         if self.validate_schemas:
             self._load_schema(schema_path)
 
+        self._bind_validator()
+
         # Initialize service clients
         self.discovery = DiscoveryClient(self)
         self.linking = LinkingClient(self)
@@ -91,6 +249,26 @@ class ABDMClient:
         self.health_information = HealthInformationClient(self)
         self.hip_callbacks = HIPCallbacksClient(self)
 
+    @property
+    def validate_schemas(self) -> bool:
+        """Whether responses are validated against the ABDM schema."""
+        return self._validate_schemas
+
+    @validate_schemas.setter
+    def validate_schemas(self, value: bool):
+        self._validate_schemas = value
+        self._bind_validator()
+
+    def _bind_validator(self):
+        """
+        Pick the response validator request() calls, once per state change,
+        so the hot path does no enabled/loaded checks.
+        """
+        if self._validate_schemas and getattr(self, "schema", None):
+            self._validate_fn = self._do_validate
+        else:
+            self._validate_fn = self._noop_validate
+
     def _load_schema(self, schema_path: Optional[str] = None):
         """Load and validate official ABDM schema."""
         if schema_path is None:
@@ -107,14 +285,9 @@ class ABDMClient:
                     break
 
         if schema_path and Path(schema_path).exists():
-            with open(schema_path, 'r') as f:
-                self.schema = yaml.safe_load(f)
-
-            # Validate that the schema itself is valid OpenAPI
-            try:
-                validate(self.schema)
-            except Exception as e:
-                raise ValidationError(f"Invalid OpenAPI schema: {str(e)}")
+            path = Path(schema_path).resolve()
+            self._schema_key = (str(path), path.stat().st_mtime_ns)
+            self.schema = _load_schema_cached(*self._schema_key)
         else:
             # Disable validation if schema not found
             self.validate_schemas = False
@@ -132,23 +305,35 @@ class ABDMClient:
         """
         if not self.validate_schemas or not self.schema:
             return
+        self._do_validate(response, schema_ref)
 
-        # Get schema definition
-        schemas = self.schema.get("components", {}).get("schemas", {})
-        if schema_ref not in schemas:
-            return  # Schema not found, skip validation
+    @staticmethod
+    def _noop_validate(response: Dict[str, Any], schema_ref: str):
+        """Stand-in for _do_validate when schema validation is off."""
 
-        schema_def = schemas[schema_ref]
+    def _do_validate(self, response: Dict[str, Any], schema_ref: str):
+        """Validate response against schema_ref; assumes a schema is loaded."""
+        try:
+            validator = self._validators[schema_ref]
+        except KeyError:
+            validator = self._validators[schema_ref] = _get_validator(*self._schema_key, schema_ref)
+        if validator is None:
+            return  # Schema not found, skip validation
 
-        # Check required fields
-        required_fields = schema_def.get("required", [])
-        missing_fields = [f for f in required_fields if f not in response]
+        if validator.is_valid(response):
+            return
 
-        if missing_fields:
-            raise SchemaValidationError(
-                f"Response missing required fields: {', '.join(missing_fields)}",
-                details={"missing_fields": missing_fields}
-            )
+        # Cold path: collect every violation for the error report
+        errors = [
+            {"path": _error_path(e), "message": e.message}
+            for e in validator.iter_errors(response)
+        ]
+        required = self.schema["components"]["schemas"][schema_ref].get("required", ())
+        missing_fields = sorted(f for f in required if f not in response)
+        raise SchemaValidationError(
+            f"Response does not match {schema_ref}: {errors[0]['message']}",
+            details={"missing_fields": missing_fields, "errors": errors}
+        )
 
     async def request(
         self,
@@ -177,28 +362,33 @@ class ABDMClient:
             ABDMError: If API returns an error
         """
         try:
-            response = await self.http_client.request(
-                method=method,
-                url=endpoint,
-                json=data,
-                params=params
-            )
+            gate = self._gate
+            if gate is None:
+                response, content = await self._send(method, endpoint, data, params)
+            else:
+                async with gate:
+                    started = monotonic()
+                    try:
+                        response, content = await self._send(method, endpoint, data, params)
+                    except httpx.TransportError:
+                        gate.record((monotonic() - started) * 1000, None)
+                        raise
+                    gate.record((monotonic() - started) * 1000, response.status_code)
+
+            # Parse the body once, then branch on the status
+            result = orjson.loads(content) if content else {}
 
             # Handle non-2xx responses
             if response.status_code >= 400:
-                error_data = response.json() if response.content else {}
                 raise ABDMError(
-                    message=error_data.get("message", f"HTTP {response.status_code}"),
+                    message=result.get("message", f"HTTP {response.status_code}"),
                     error_code=response.status_code,
-                    details=error_data
+                    details=result
                 )
 
-            # Parse response
-            result = response.json() if response.content else {}
-
             # Validate against schema if requested
             if validate_response_schema:
-                self.validate_response(result, validate_response_schema)
+                self._validate_fn(result, validate_response_schema)
 
             return result
 
@@ -211,6 +401,24 @@ class ABDMClient:
         except Exception as e:
             raise ABDMError(f"Unexpected error: {str(e)}")
 
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict],
+        params: Optional[Dict]
+    ) -> Tuple[httpx.Response, bytes]:
+        """Send one request and read its whole body."""
+        # Encode with orjson rather than letting httpx use stdlib json
+        response = await self.http_client.request(
+            method=method,
+            url=endpoint,
+            content=orjson.dumps(data, option=_ORJSON_OPTIONS) if data is not None else None,
+            headers=_JSON_HEADERS if data is not None else None,
+            params=params
+        )
+        return response, await response.aread()
+
     # High-level convenience methods
 
     async def discover_patient(
@@ -374,6 +582,71 @@ class ABDMClient:
             timeout=timeout
         )
 
+    # Batch helpers: submit every call at once over the shared connection pool
+
+    async def discover_patients(
+        self,
+        queries: List[Dict[str, Any]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Discover several patients concurrently.
+
+        Args:
+            queries: One dict of discover_patient keyword arguments per patient
+            return_exceptions: Return per-query exceptions in place of results
+                instead of raising the first one
+
+        Returns:
+            Discovery results in the same order as queries
+        """
+        return await asyncio.gather(
+            *(self.discover_patient(**q) for q in queries),
+            return_exceptions=return_exceptions
+        )
+
+    async def request_consents(
+        self,
+        requests: List[Dict[str, Any]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Request several consents concurrently.
+
+        Args:
+            requests: One dict of request_consent keyword arguments per consent
+            return_exceptions: Return per-request exceptions in place of results
+                instead of raising the first one
+
+        Returns:
+            Consent request details in the same order as requests
+        """
+        return await asyncio.gather(
+            *(self.request_consent(**r) for r in requests),
+            return_exceptions=return_exceptions
+        )
+
+    async def fetch_health_information_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fetch health information for several consents concurrently.
+
+        Args:
+            requests: One dict of fetch_health_information keyword arguments per consent
+            return_exceptions: Return per-request exceptions in place of results
+                instead of raising the first one
+
+        Returns:
+            Health information request acknowledgements in the same order as requests
+        """
+        return await asyncio.gather(
+            *(self.fetch_health_information(**r) for r in requests),
+            return_exceptions=return_exceptions
+        )
+
     async def close(self):
         """Close HTTP client connections."""
         await self.http_client.aclose()
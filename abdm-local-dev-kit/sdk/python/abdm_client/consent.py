@@ -4,24 +4,35 @@ Consent Management Client
 Handles consent request and artefact operations.
 """
 
+import functools
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from uuid import uuid4
 
+from ._ids import new_uuid
 from .exceptions import ConsentError, ValidationError
 
 # Valid ABDM purpose codes
-VALID_PURPOSE_CODES = {
+VALID_PURPOSE_CODES = frozenset({
     "CAREMGT",  # Care Management
     "BTG",      # Break the Glass
     "PUBHLTH",  # Public Health
     "HPAYMT",   # Healthcare Payment
     "DSRCH",    # Disease Specific Healthcare Research
     "PATRQT"    # Self Requested
+})
+
+# Human-readable text for each purpose code
+_PURPOSE_TEXT = {
+    "CAREMGT": "Care Management",
+    "BTG": "Break the Glass",
+    "PUBHLTH": "Public Health",
+    "HPAYMT": "Healthcare Payment",
+    "DSRCH": "Disease Specific Healthcare Research",
+    "PATRQT": "Self Requested"
 }
 
 # Valid HI types
-VALID_HI_TYPES = {
+VALID_HI_TYPES = frozenset({
     "OPConsultation",
     "Prescription",
     "DischargeSummary",
@@ -29,14 +40,53 @@ VALID_HI_TYPES = {
     "ImmunizationRecord",
     "HealthDocumentRecord",
     "WellnessRecord"
-}
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _purpose_block(purpose: str) -> Dict[str, str]:
+    """Shared consent.purpose block; built once per purpose code."""
+    return {
+        "text": _PURPOSE_TEXT.get(purpose, purpose),
+        "code": purpose,
+        "refUri": "http://terminology.hl7.org/ValueSet/v3-PurposeOfUse"
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _requester_block(name: str, requester_id: str, system: str) -> Dict[str, Any]:
+    """Shared consent.requester block; built once per requester."""
+    return {
+        "name": name,
+        "identifier": {
+            "type": "REGNO",
+            "value": requester_id,
+            "system": system
+        }
+    }
 
 
 class ConsentClient:
     """Client for consent management operations."""
 
+    _INIT_ENDPOINT = "/v0.5/consent-requests/init"
+    _FETCH_ENDPOINT = "/v0.5/consents/fetch"
+
     def __init__(self, parent_client):
         self.client = parent_client
+        # client_id is fixed once the parent client is built
+        self._hiu_id = parent_client.client_id or "HIU-001"
+        self._notification_base = parent_client.base_url
+        self._notification_url = f"{parent_client.base_url}/callback/consent"
+
+    @property
+    def _consent_notification_url(self) -> str:
+        """Callback URL for consent notifications, re-formatted only if base_url changes."""
+        base_url = self.client.base_url
+        if base_url != self._notification_base:
+            self._notification_base = base_url
+            self._notification_url = f"{base_url}/callback/consent"
+        return self._notification_url
 
     async def request(
         self,
@@ -92,10 +142,10 @@ class ConsentClient:
             )
 
         # Validate HI types
-        invalid_types = [t for t in hi_types if t not in VALID_HI_TYPES]
+        invalid_types = set(hi_types) - VALID_HI_TYPES
         if invalid_types:
             raise ValidationError(
-                f"Invalid HI types: {', '.join(invalid_types)}. "
+                f"Invalid HI types: {', '.join(sorted(invalid_types))}. "
                 f"Valid types: {', '.join(VALID_HI_TYPES)}"
             )
 
@@ -103,46 +153,37 @@ class ConsentClient:
         if "@" not in patient_abha:
             patient_abha = f"{patient_abha}@sbx"
 
-        # Set defaults
+        # Set defaults (one clock read for the whole request)
+        now = datetime.now()
+        now_iso = now.isoformat()
         if date_from is None:
-            date_from = datetime.now() - timedelta(days=365)
+            date_from = now - timedelta(days=365)
         if date_to is None:
-            date_to = datetime.now()
+            date_to = now
         if data_erase_at is None:
-            data_erase_at = datetime.now() + timedelta(days=30)
+            data_erase_at = now + timedelta(days=30)
 
         # Build request
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "consent": {
-                "purpose": {
-                    "text": self._get_purpose_text(purpose),
-                    "code": purpose,
-                    "refUri": "http://terminology.hl7.org/ValueSet/v3-PurposeOfUse"
-                },
+                "purpose": _purpose_block(purpose),
                 "patient": {
                     "id": patient_abha
                 },
                 "hiu": {
-                    "id": self.client.client_id or "HIU-001"
-                },
-                "requester": {
-                    "name": requester_name,
-                    "identifier": {
-                        "type": "REGNO",
-                        "value": requester_id,
-                        "system": requester_system
-                    }
+                    "id": self._hiu_id
                 },
+                "requester": _requester_block(requester_name, requester_id, requester_system),
                 "hiTypes": hi_types,
                 "permission": {
                     "accessMode": access_mode,
                     "dateRange": {
                         "from": date_from.isoformat(),
-                        "to": date_to.isoformat()
+                        "to": now_iso if date_to is now else date_to.isoformat()
                     },
                     "dataEraseAt": data_erase_at.isoformat(),
                     "frequency": {
@@ -151,14 +192,14 @@ class ConsentClient:
                         "repeats": frequency_repeats
                     }
                 },
-                "consentNotificationUrl": f"{self.client.base_url}/callback/consent"
+                "consentNotificationUrl": self._consent_notification_url
             }
         }
 
         # Send consent request
         response = await self.client.request(
             method="POST",
-            endpoint="/v0.5/consent-requests/init",
+            endpoint=self._INIT_ENDPOINT,
             data=request_data
         )
 
@@ -178,15 +219,7 @@ class ConsentClient:
 
     def _get_purpose_text(self, purpose_code: str) -> str:
         """Get human-readable text for purpose code."""
-        purpose_map = {
-            "CAREMGT": "Care Management",
-            "BTG": "Break the Glass",
-            "PUBHLTH": "Public Health",
-            "HPAYMT": "Healthcare Payment",
-            "DSRCH": "Disease Specific Healthcare Research",
-            "PATRQT": "Self Requested"
-        }
-        return purpose_map.get(purpose_code, purpose_code)
+        return _PURPOSE_TEXT.get(purpose_code, purpose_code)
 
     async def fetch(
         self,
@@ -206,7 +239,7 @@ class ConsentClient:
         Raises:
             ConsentError: If consent fetch fails
         """
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
@@ -216,7 +249,7 @@ class ConsentClient:
 
         response = await self.client.request(
             method="POST",
-            endpoint="/v0.5/consents/fetch",
+            endpoint=self._FETCH_ENDPOINT,
             data=request_data
         )
 
@@ -6,14 +6,16 @@ Handles patient discovery by ABHA number, mobile, or demographics.
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from uuid import uuid4
 
+from ._ids import new_uuid
 from .exceptions import PatientNotFoundError, ValidationError
 
 
 class DiscoveryClient:
     """Client for patient discovery operations."""
 
+    _DISCOVER_ENDPOINT = "/v0.5/care-contexts/discover"
+
     def __init__(self, parent_client):
         self.client = parent_client
 
@@ -84,8 +86,8 @@ class DiscoveryClient:
             })
 
         # Build request
-        request_id = str(uuid4())
-        transaction_id = str(uuid4())
+        request_id = new_uuid()
+        transaction_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
@@ -103,7 +105,7 @@ class DiscoveryClient:
         # Send discovery request
         response = await self.client.request(
             method="POST",
-            endpoint="/v0.5/care-contexts/discover",
+            endpoint=self._DISCOVER_ENDPOINT,
             data=request_data,
             validate_response_schema="PatientDiscoveryResult"
         )
@@ -6,18 +6,23 @@ Handles health information requests and data transfer.
 
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from uuid import uuid4
 import base64
-import os
+import secrets
 
+from ._ids import new_uuid
 from .exceptions import ConsentError, ValidationError
 
 
 class HealthInformationClient:
     """Client for health information request operations."""
 
+    _REQUEST_ENDPOINT = "/v0.5/health-information/cm/request"
+
     def __init__(self, parent_client):
         self.client = parent_client
+        # Constant keyMaterial fields, merged into each request's key material
+        self._key_material_static = {"cryptoAlg": "ECDH", "curve": "Curve25519"}
+        self._dh_key_parameters = "Curve25519/32byte random key"
 
     async def request(
         self,
@@ -59,33 +64,34 @@ class HealthInformationClient:
         if not encryption_public_key:
             encryption_public_key = self._generate_demo_key()
 
-        # Set date defaults
+        # Set date defaults (one clock read for the whole request)
+        now = datetime.now()
+        now_iso = now.isoformat()
         if date_from is None:
-            date_from = datetime.now() - timedelta(days=365)
+            date_from = now - timedelta(days=365)
         if date_to is None:
-            date_to = datetime.now()
+            date_to = now
 
         # Build request
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "hiRequest": {
                 "consent": {
                     "id": consent_id
                 },
                 "dateRange": {
                     "from": date_from.isoformat(),
-                    "to": date_to.isoformat()
+                    "to": now_iso if date_to is now else date_to.isoformat()
                 },
                 "dataPushUrl": data_push_url,
                 "keyMaterial": {
-                    "cryptoAlg": "ECDH",
-                    "curve": "Curve25519",
+                    **self._key_material_static,
                     "dhPublicKey": {
-                        "expiry": (datetime.now() + timedelta(days=1)).isoformat(),
-                        "parameters": "Curve25519/32byte random key",
+                        "expiry": (now + timedelta(days=1)).isoformat(),
+                        "parameters": self._dh_key_parameters,
                         "keyValue": encryption_public_key
                     },
                     "nonce": self._generate_nonce()
@@ -96,7 +102,7 @@ class HealthInformationClient:
         # Send HI request
         response = await self.client.request(
             method="POST",
-            endpoint="/v0.5/health-information/cm/request",
+            endpoint=self._REQUEST_ENDPOINT,
             data=request_data,
             validate_response_schema="HIUHealthInformationRequestResponse"
         )
@@ -119,9 +125,9 @@ class HealthInformationClient:
 
     def _generate_demo_key(self) -> str:
         """Generate a demo public key (base64 encoded random bytes)."""
-        random_bytes = os.urandom(32)
-        return base64.b64encode(random_bytes).decode('utf-8')
+        # Standard base64 (not token_urlsafe): keyValue is documented as Base64
+        return base64.b64encode(secrets.token_bytes(32)).decode('ascii')
 
     def _generate_nonce(self) -> str:
-        """Generate a random nonce."""
-        return str(uuid4())
+        """Generate a random 32-byte nonce (hex encoded)."""
+        return secrets.token_hex(32)
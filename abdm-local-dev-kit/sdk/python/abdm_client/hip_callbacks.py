@@ -7,16 +7,87 @@ Provides helper methods for HIP (Health Information Provider) implementations:
 3. Validate callback request/response schemas
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
-from datetime import datetime
-from uuid import uuid4
-
-from .exceptions import ValidationError, ABDMError
+from time import gmtime, strftime, time as _time
+
+from ._ids import new_uuid
+from .exceptions import ABDMError
+from ._payloads import NON_EMPTY_STRING, compile_validator
+
+
+_CARE_CONTEXT_LIST_SCHEMA = {
+    "type": "array",
+    "minItems": 1,
+    "items": {
+        "type": "object",
+        "required": ["referenceNumber"],
+        "properties": {"display": {"type": "string"}}
+    }
+}
+
+_VALIDATE_ADD_CONTEXTS = compile_validator({
+    "type": "object",
+    "properties": {
+        "patient_ref": NON_EMPTY_STRING,
+        "link_ref": NON_EMPTY_STRING,
+        "care_contexts": _CARE_CONTEXT_LIST_SCHEMA
+    }
+})
+
+_VALIDATE_NOTIFY_CONTEXT = compile_validator({
+    "type": "object",
+    "required": ["patientReference", "careContextReference"],
+    "properties": {
+        "careContextReference": NON_EMPTY_STRING,
+        "display": {"type": "string"}
+    }
+}, name="care_context")
+
+_VALIDATE_CARE_CONTEXTS = compile_validator(_CARE_CONTEXT_LIST_SCHEMA, name="care_contexts")
+
+_VALIDATE_PATIENT = compile_validator({
+    "type": "object",
+    "required": ["referenceNumber", "display"],
+    "properties": {"careContexts": _CARE_CONTEXT_LIST_SCHEMA}
+}, name="patient")
+
+
+def _iso_utc_now() -> str:
+    """Current UTC time as ISO 8601 with milliseconds and a "Z" suffix."""
+    t = _time()
+    return f"{strftime('%Y-%m-%dT%H:%M:%S', gmtime(t))}.{int(t % 1 * 1000):03d}Z"
+
+
+def _callback_response(
+    request_id: str,
+    timestamp: Optional[str],
+    result_key: str,
+    result: Optional[Dict[str, Any]],
+    error: Optional[Dict[str, Any]],
+    **fields: Any
+) -> Dict[str, Any]:
+    """Shared body of the build_on_*_response helpers."""
+    response = {
+        "requestId": request_id,
+        "timestamp": timestamp or _iso_utc_now(),
+        **fields,
+        "resp": {"requestId": request_id}
+    }
+
+    if result:
+        response[result_key] = result
+    elif error:
+        response["error"] = error
+
+    return response
 
 
 class HIPCallbacksClient:
     """Client for HIP callback operations and notifications."""
 
+    __slots__ = ("client",)
+
     def __init__(self, parent_client):
         self.client = parent_client
 
@@ -64,34 +135,26 @@ class HIPCallbacksClient:
             ...     ]
             ... )
         """
-        if not patient_ref:
-            raise ValidationError("patient_ref is required")
-
-        if not link_ref:
-            raise ValidationError("link_ref is required")
-
-        if not care_contexts or len(care_contexts) == 0:
-            raise ValidationError("At least one care context is required")
-
-        # Validate care context structure
-        for cc in care_contexts:
-            if "referenceNumber" not in cc:
-                raise ValidationError("Each care context must have 'referenceNumber'")
+        _VALIDATE_ADD_CONTEXTS({
+            "patient_ref": patient_ref,
+            "link_ref": link_ref,
+            "care_contexts": care_contexts
+        })
 
         # Build request
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
+            "timestamp": _iso_utc_now(),
             "link": {
                 "referenceNumber": link_ref,
-                "display": f"Link {link_ref}",  # Required field
+                "display": "Link " + link_ref,  # Required field
                 "authenticationType": "DIRECT"
             },
             "patient": {
                 "referenceNumber": patient_ref,
-                "display": f"Patient {patient_ref}"  # Required field
+                "display": "Patient " + patient_ref  # Required field
             },
             "careContexts": care_contexts  # At root level, not under patient
         }
@@ -108,6 +171,39 @@ class HIPCallbacksClient:
             "requestId": request_id
         }
 
+    async def add_care_contexts_bulk(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: int = 16,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Add care contexts to several patient links concurrently.
+
+        The gateway's add-contexts endpoint takes one link per request, so
+        this fans the calls out over the shared connection pool, keeping at
+        most max_concurrency in flight to stay under gateway rate limits.
+
+        Args:
+            items: One dict of add_care_contexts keyword arguments per link
+            max_concurrency: Maximum number of requests in flight at once
+            return_exceptions: Return per-item exceptions in place of results
+                instead of raising the first one
+
+        Returns:
+            add_care_contexts results in the same order as items
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def add(item: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.add_care_contexts(**item)
+
+        return await asyncio.gather(
+            *(add(item) for item in items),
+            return_exceptions=return_exceptions
+        )
+
     async def notify_context(
         self,
         care_context: Dict[str, str],
@@ -150,14 +246,7 @@ class HIPCallbacksClient:
             ...     hi_types=["DiagnosticReport", "Prescription"]
             ... )
         """
-        if not care_context:
-            raise ValidationError("care_context is required")
-
-        if "patientReference" not in care_context:
-            raise ValidationError("care_context must have 'patientReference'")
-
-        if "careContextReference" not in care_context:
-            raise ValidationError("care_context must have 'careContextReference'")
+        _VALIDATE_NOTIFY_CONTEXT(care_context)
 
         # Default HI types
         if not hi_types:
@@ -165,19 +254,25 @@ class HIPCallbacksClient:
             if isinstance(hi_types, str):
                 hi_types = [hi_types]
 
+        ref = care_context["careContextReference"]
+        display = care_context.get("display")
+        if display is None:
+            display = "Care Context " + ref
+
         # Build request
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
+        timestamp = _iso_utc_now()
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
+            "timestamp": timestamp,
             "notification": {
                 "careContext": {
-                    "referenceNumber": care_context.get("careContextReference", care_context.get("referenceNumber", "UNKNOWN")),
-                    "display": care_context.get("display", f"Care Context {care_context.get('careContextReference', 'UNKNOWN')}")
+                    "referenceNumber": ref,
+                    "display": display
                 },
                 "hiTypes": hi_types,
-                "date": datetime.now().isoformat() + "Z"
+                "date": timestamp
             }
         }
 
@@ -202,7 +297,8 @@ class HIPCallbacksClient:
         request_id: str,
         transaction_id: str,
         patient: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-discover callback.
@@ -221,6 +317,8 @@ class HIPCallbacksClient:
                 }
             error: Error details if patient not found:
                 {"code": 1000, "message": "Patient not found"}
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
@@ -237,27 +335,17 @@ class HIPCallbacksClient:
             ...     }
             ... )
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "transactionId": transaction_id,
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if patient:
-            response["patient"] = patient
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(
+            request_id, timestamp, "patient", patient, error,
+            transactionId=transaction_id
+        )
 
     @staticmethod
     def build_on_init_response(
         request_id: str,
         link: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-init callback.
@@ -275,30 +363,20 @@ class HIPCallbacksClient:
                     }
                 }
             error: Error details if failed
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if link:
-            response["link"] = link
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(request_id, timestamp, "link", link, error)
 
     @staticmethod
     def build_on_confirm_response(
         request_id: str,
         patient: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-confirm callback.
@@ -314,30 +392,20 @@ class HIPCallbacksClient:
                     ]
                 }
             error: Error details if failed (e.g., invalid OTP)
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if patient:
-            response["patient"] = patient
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(request_id, timestamp, "patient", patient, error)
 
     @staticmethod
     def build_on_request_response(
         request_id: str,
         hi_request: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-request callback (health info).
@@ -350,30 +418,20 @@ class HIPCallbacksClient:
                     "sessionStatus": "ACKNOWLEDGED"
                 }
             error: Error details if failed
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if hi_request:
-            response["hiRequest"] = hi_request
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(request_id, timestamp, "hiRequest", hi_request, error)
 
     @staticmethod
     def build_on_add_contexts_response(
         request_id: str,
         acknowledgement: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-add-contexts callback.
@@ -383,30 +441,20 @@ class HIPCallbacksClient:
             acknowledgement: Acknowledgement if successful:
                 {"status": "CONTEXTS_ADDED"}
             error: Error details if failed
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if acknowledgement:
-            response["acknowledgement"] = acknowledgement
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(request_id, timestamp, "acknowledgement", acknowledgement, error)
 
     @staticmethod
     def build_on_notify_response(
         request_id: str,
         acknowledgement: Optional[Dict[str, Any]] = None,
-        error: Optional[Dict[str, Any]] = None
+        error: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Build a properly formatted response for on-notify callback.
@@ -416,24 +464,13 @@ class HIPCallbacksClient:
             acknowledgement: Acknowledgement if successful:
                 {"status": "OK"}
             error: Error details if failed
+            timestamp: ISO 8601 timestamp to send (default: now); pass one
+                shared value when building many responses in a batch
 
         Returns:
             Formatted callback response dictionary
         """
-        response = {
-            "requestId": request_id,
-            "timestamp": datetime.now().isoformat() + "Z",
-            "resp": {
-                "requestId": request_id
-            }
-        }
-
-        if acknowledgement:
-            response["acknowledgement"] = acknowledgement
-        elif error:
-            response["error"] = error
-
-        return response
+        return _callback_response(request_id, timestamp, "acknowledgement", acknowledgement, error)
 
     # ========================================================================
     # Validation Helpers
@@ -450,21 +487,7 @@ class HIPCallbacksClient:
         Raises:
             ValidationError: If care contexts are invalid
         """
-        if not isinstance(care_contexts, list):
-            raise ValidationError("care_contexts must be a list")
-
-        if len(care_contexts) == 0:
-            raise ValidationError("At least one care context is required")
-
-        for idx, cc in enumerate(care_contexts):
-            if not isinstance(cc, dict):
-                raise ValidationError(f"Care context #{idx} must be a dictionary")
-
-            if "referenceNumber" not in cc:
-                raise ValidationError(f"Care context #{idx} missing 'referenceNumber'")
-
-            if "display" in cc and not isinstance(cc["display"], str):
-                raise ValidationError(f"Care context #{idx} 'display' must be a string")
+        _VALIDATE_CARE_CONTEXTS(care_contexts)
 
     @staticmethod
     def validate_patient_data(patient: Dict[str, Any]) -> None:
@@ -477,11 +500,4 @@ class HIPCallbacksClient:
         Raises:
             ValidationError: If patient data is invalid
         """
-        required_fields = ["referenceNumber", "display"]
-
-        for field in required_fields:
-            if field not in patient:
-                raise ValidationError(f"Patient data missing required field: {field}")
-
-        if "careContexts" in patient:
-            HIPCallbacksClient.validate_care_contexts(patient["careContexts"])
+        _VALIDATE_PATIENT(patient)
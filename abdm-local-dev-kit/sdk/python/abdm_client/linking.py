@@ -5,15 +5,35 @@ Handles OTP-based care context linking.
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
-from uuid import uuid4
+from datetime import datetime, timezone
 
-from .exceptions import LinkingError, ValidationError
+from ._ids import new_uuid
+from .exceptions import LinkingError
+from ._payloads import NON_EMPTY_STRING, compile_validator
+
+
+_VALIDATE_LINK_PATIENT = compile_validator({
+    "type": "object",
+    "properties": {
+        "patient_ref": NON_EMPTY_STRING,
+        "care_contexts": {"type": "array", "minItems": 1}
+    }
+})
+
+_VALIDATE_LINK_CONFIRMATION = compile_validator({
+    "type": "object",
+    "properties": {
+        "link_ref": NON_EMPTY_STRING,
+        "otp": NON_EMPTY_STRING
+    }
+})
 
 
 class LinkingClient:
     """Client for care context linking operations."""
 
+    __slots__ = ("client",)
+
     def __init__(self, parent_client):
         self.client = parent_client
 
@@ -48,19 +68,15 @@ class LinkingClient:
             ValidationError: If invalid parameters
             LinkingError: If linking fails
         """
-        if not patient_ref:
-            raise ValidationError("patient_ref is required")
-
-        if not care_contexts or len(care_contexts) == 0:
-            raise ValidationError("At least one care context is required")
+        _VALIDATE_LINK_PATIENT({"patient_ref": patient_ref, "care_contexts": care_contexts})
 
         # Build request
-        request_id = str(uuid4())
-        transaction_id = str(uuid4())
+        request_id = new_uuid()
+        transaction_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc),
             "transactionId": transaction_id,
             "patient": {
                 "id": patient_abha or f"{patient_ref}@sbx",
@@ -125,18 +141,14 @@ class LinkingClient:
         Raises:
             LinkingError: If OTP is invalid or linking fails
         """
-        if not link_ref:
-            raise ValidationError("link_ref is required")
-
-        if not otp:
-            raise ValidationError("OTP is required")
+        _VALIDATE_LINK_CONFIRMATION({"link_ref": link_ref, "otp": otp})
 
         # Build request
-        request_id = str(uuid4())
+        request_id = new_uuid()
 
         request_data = {
             "requestId": request_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc),
             "confirmation": {
                 "linkRefNumber": link_ref,
                 "token": otp
@@ -109,4 +109,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop  # optional: installed with the "fast" extra
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
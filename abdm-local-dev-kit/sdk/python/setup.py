@@ -24,10 +24,13 @@ setup(
     license="MIT",
     packages=find_packages(exclude=["tests", "tests.*", "examples", "examples.*"]),
     install_requires=[
-        "httpx>=0.26.0",
+        "httpx[http2]>=0.26.0",
         "pyyaml>=6.0.1",
         "openapi-spec-validator>=0.7.0",
-        "pydantic>=2.7.0"
+        "openapi-schema-validator>=0.6.0",
+        "pydantic>=2.7.0",
+        "orjson>=3.9.0",
+        "fastjsonschema>=2.19.0"
     ],
     extras_require={
         "dev": [
@@ -36,6 +39,10 @@ setup(
             "black>=23.0.0",
             "mypy>=1.0.0",
             "ruff>=0.1.0"
+        ],
+        "fast": [
+            "jsonschema-rs>=0.20.0",
+            "uvloop>=0.18.0; sys_platform != 'win32'"
         ]
     },
     python_requires=">=3.10",
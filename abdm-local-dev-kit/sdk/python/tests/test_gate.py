@@ -0,0 +1,129 @@
+"""Tests for the adaptive concurrency gate."""
+
+import asyncio
+
+import pytest
+
+from abdm_client import _gate
+from abdm_client._gate import AIMDGate
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(_gate, "monotonic", fake)
+    return fake
+
+
+class TestRecord:
+
+    def test_fast_response_grows_limit_by_alpha_over_limit(self, clock):
+        gate = AIMDGate(initial=8, alpha=0.5)
+        gate.record(10, 200)
+        assert gate.limit == pytest.approx(8 + 0.5 / 8)
+        gate.record(10, 200)
+        first = 8 + 0.5 / 8
+        assert gate.limit == pytest.approx(first + 0.5 / first)
+
+    def test_growth_is_capped_at_max_limit(self, clock):
+        gate = AIMDGate(initial=10, alpha=5, max_limit=10)
+        gate.record(10, 200)
+        assert gate.limit == 10
+
+    @pytest.mark.parametrize("status", [429, 500, 503, None])
+    def test_overload_halves_limit_and_opens_cooldown(self, clock, status):
+        gate = AIMDGate(initial=8, beta=0.5, cooldown=1.0)
+        gate.record(10, status)
+        assert gate.limit == 4
+        assert gate._open_until == clock.now + 1.0
+
+    def test_overload_decreases_at_most_once_per_window(self, clock):
+        gate = AIMDGate(initial=16, beta=0.5, target_latency_ms=2000)
+        gate.record(10, 503)
+        gate.record(10, 429)
+        gate.record(10, None)
+        assert gate.limit == 8
+
+        clock.now += 1.9
+        gate.record(10, 503)
+        assert gate.limit == 8
+
+        clock.now += 0.1
+        gate.record(10, 503)
+        assert gate.limit == 4
+
+    def test_slow_success_decreases_without_opening_cooldown(self, clock):
+        gate = AIMDGate(initial=8, target_latency_ms=2000)
+        gate.record(2500, 200)
+        assert gate.limit == 4
+        assert gate._open_until == 0.0
+
+    def test_client_error_is_not_overload(self, clock):
+        gate = AIMDGate(initial=8)
+        gate.record(10, 404)
+        assert gate.limit > 8
+        assert gate._open_until == 0.0
+
+    def test_limit_never_drops_below_min_limit(self, clock):
+        gate = AIMDGate(initial=2, beta=0.1, min_limit=1)
+        gate.record(10, 503)
+        assert gate.limit == 1
+
+
+class TestAdmission:
+
+    async def test_in_flight_never_exceeds_limit(self):
+        gate = AIMDGate(initial=3, alpha=2, max_limit=6)
+        peak_over = []
+
+        async def request(i: int):
+            async with gate:
+                peak_over.append(gate.in_flight - int(gate.limit))
+                await asyncio.sleep(0.001 * (i % 3))
+                gate.record(1, 200)
+
+        await asyncio.wait_for(asyncio.gather(*(request(i) for i in range(50))), 5)
+
+        assert max(peak_over) <= 0
+        assert gate.in_flight == 0
+
+    async def test_in_flight_returns_to_zero_after_errors(self):
+        gate = AIMDGate(initial=2)
+
+        async def failing():
+            async with gate:
+                raise RuntimeError("boom")
+
+        results = await asyncio.gather(*(failing() for _ in range(5)), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert gate.in_flight == 0
+
+    async def test_waiters_inside_cooldown_are_released_after_it(self):
+        gate = AIMDGate(initial=4, cooldown=0.05)
+        gate.record(10, 503)
+        loop = asyncio.get_running_loop()
+        opened_until = gate._open_until
+        entered = []
+
+        async def request():
+            async with gate:
+                entered.append(_gate.monotonic())
+
+        started = loop.time()
+        await asyncio.wait_for(asyncio.gather(*(request() for _ in range(6))), 2)
+
+        assert len(entered) == 6
+        assert min(entered) >= opened_until
+        assert loop.time() - started < 1
+        assert gate.in_flight == 0
@@ -0,0 +1,47 @@
+"""Tests for the gateway schema JSON sidecar."""
+
+import shutil
+from pathlib import Path
+
+import orjson
+import pytest
+
+from abdm_client.client import _load_schema_cached
+
+GATEWAY_YAML = Path(__file__).resolve().parents[3] / "api-schemas" / "gateway.yaml"
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "gateway.yaml"
+    shutil.copy(GATEWAY_YAML, path)
+    _load_schema_cached.cache_clear()
+    yield path
+    _load_schema_cached.cache_clear()
+
+
+def load(path: Path):
+    _load_schema_cached.cache_clear()
+    return _load_schema_cached(str(path), path.stat().st_mtime_ns)
+
+
+class TestSchemaSidecar:
+
+    def test_parse_writes_sidecar_without_temp_files(self, schema_path):
+        schema = load(schema_path)
+
+        sidecar = schema_path.with_name("gateway.yaml.cache.json")
+        assert orjson.loads(sidecar.read_bytes()) == schema
+        assert sorted(p.name for p in schema_path.parent.iterdir()) == [
+            "gateway.yaml", "gateway.yaml.cache.json"
+        ]
+
+    @pytest.mark.parametrize("keep", [0, 0.5])
+    def test_truncated_sidecar_is_reparsed_and_rewritten(self, schema_path, keep):
+        schema = load(schema_path)
+        sidecar = schema_path.with_name("gateway.yaml.cache.json")
+        data = sidecar.read_bytes()
+        sidecar.write_bytes(data[:int(len(data) * keep)])
+
+        assert load(schema_path) == schema
+        assert sidecar.read_bytes() == data
@@ -8,23 +8,62 @@ Handles consent request lifecycle:
 4. Callback to HIU via Gateway
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Optional, List
-from datetime import datetime, timedelta
-from uuid import UUID, uuid4
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
 import logging
 import httpx
+import orjson
 
 from models.consent import (
     ConsentRequest, ConsentRequestResponse, ConsentStatus,
     ConsentRequestDocument, ConsentArtefactDocument,
     ConsentArtefact, ConsentArtefactDetail
 )
-from dependencies import get_database
+from dependencies import get_database, get_http_client
+from ids import new_uuid
+from cache import (
+    consent_request_cache, consent_artefact_cache,
+    consent_request_generation, cache_consent_request
+)
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# UUIDs and datetimes go into callback payloads as-is; naive datetimes
+# (Mongo reads) are UTC
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# Only the fields the status and fetch callbacks read are pulled from Mongo
+_STATUS_PROJECTION = {
+    "_id": 0,
+    "consent_request_id": 1,
+    "status": 1,
+    "created_at": 1,
+    "hi_types": 1,
+    "consent_request.consent.purpose": 1,
+    "consent_request.consent.patient": 1,
+    "consent_request.consent.hiu": 1,
+    "consent_request.consent.permission": 1
+}
+_FETCH_PROJECTION = {"_id": 0, "consent_artefact": 1}
+
+# Gateway callbacks are queued and sent by a few long-lived workers over the
+# shared client, instead of one background task per request
+_CALLBACK_WORKERS = 4
+_CALLBACK_QUEUE_SIZE = 10_000
+_callback_queue: Optional[asyncio.Queue] = None
+_callback_workers: List[asyncio.Task] = []
+
+# Transient callback failures are retried after ~0.5s, then ~1s
+_CALLBACK_ATTEMPTS = 3
+_CALLBACK_BACKOFF = 0.5
+
 router = APIRouter(prefix="/v0.5", tags=["consent-requests"])
 
 
@@ -49,10 +88,89 @@ class ConsentFetchRequest(BaseModel):
     consentId: UUID
 
 
-@router.post("/consent-requests/on-init")
+# Request body validators, built once at import rather than per request
+_CONSENT_REQUEST_ADAPTER = TypeAdapter(ConsentRequest)
+_STATUS_ADAPTER = TypeAdapter(ConsentRequestStatusRequest)
+_FETCH_ADAPTER = TypeAdapter(ConsentFetchRequest)
+
+
+def _inline_refs(node, defs: dict):
+    """Replace "#/$defs/<Name>" refs with the definitions they point to."""
+    if isinstance(node, dict):
+        if "$ref" in node:
+            name = node["$ref"].rsplit("/", 1)[1]
+            rest = {k: v for k, v in node.items() if k != "$ref"}
+            return {**_inline_refs(defs[name], defs), **_inline_refs(rest, defs)}
+        return {k: _inline_refs(v, defs) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(v, defs) for v in node]
+    return node
+
+
+def _openapi_body(adapter: TypeAdapter) -> dict:
+    """
+    Request body docs for a route that reads the raw Request.
+
+    Such routes have no body parameter for FastAPI to describe, so the
+    schema is supplied through openapi_extra. Nested models are inlined:
+    "#/$defs/..." refs would not resolve inside the OpenAPI document.
+    """
+    schema = adapter.json_schema(ref_template="#/$defs/{model}")
+    defs = schema.pop("$defs", {})
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_refs(schema, defs)}}
+        }
+    }
+
+
+def _body_validation_error(e: ValidationError) -> RequestValidationError:
+    """Re-raise pydantic errors in FastAPI's 422 request body format."""
+    return RequestValidationError([
+        {**error, "loc": ("body", *error["loc"])}
+        for error in e.errors(include_url=False)
+    ])
+
+
+async def _validate_body(raw: Request, adapter: TypeAdapter):
+    """
+    Parse and validate a JSON request body in one pydantic-core pass.
+    """
+    try:
+        return adapter.validate_json(await raw.body())
+    except ValidationError as e:
+        raise _body_validation_error(e)
+
+
+async def _parse_body(raw: Request, adapter: TypeAdapter):
+    """
+    Parse a JSON request body once and validate the decoded dict.
+
+    Returns the decoded dict along with the validated model, so handlers
+    can store what the caller sent without dumping the model back out.
+    """
+    body = await raw.body()
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg}
+        }])
+
+    try:
+        return payload, adapter.validate_python(payload)
+    except ValidationError as e:
+        raise _body_validation_error(e)
+
+
+@router.post("/consent-requests/on-init", openapi_extra=_openapi_body(_CONSENT_REQUEST_ADAPTER))
 async def on_init_consent_request(
-    request: ConsentRequest,
-    background_tasks: BackgroundTasks,
+    raw: Request,
     db = Depends(get_database)
 ):
     """
@@ -65,23 +183,29 @@ async def on_init_consent_request(
     4. Callback to HIU via Gateway with consent request ID
 
     Args:
-        request: Consent request
-        background_tasks: Background tasks
+        raw: HTTP request carrying the ConsentRequest JSON body
         db: Database connection
 
     Returns:
         Acknowledgement
     """
+    # Keep the decoded body: it is stored verbatim, so the validated model
+    # never has to be dumped back to a dict
+    payload, request = await _parse_body(raw, _CONSENT_REQUEST_ADAPTER)
+
     logger.info(f"Received consent request {request.requestId} for patient {request.consent.patient.id}")
 
     # Extract patient ABHA
     patient_abha = request.consent.patient.id.split("@")[0]
 
     # Generate consent request ID
-    consent_request_id = str(uuid4())
+    consent_request_id = new_uuid()
+
+    # One clock read serves every timestamp this request produces
+    now = datetime.now(timezone.utc)
 
     # Calculate expiry (7 days from now)
-    expires_at = datetime.now() + timedelta(days=7)
+    expires_at = now + timedelta(days=7)
 
     # Create consent request document
     consent_doc = {
@@ -93,9 +217,9 @@ async def on_init_consent_request(
         "purpose_code": request.consent.purpose.code,
         "hi_types": request.consent.hiTypes,
         "status": ConsentStatus.REQUESTED.value,
-        "consent_request": request.dict(by_alias=True),
-        "created_at": datetime.now(),
-        "updated_at": datetime.now(),
+        "consent_request": payload,
+        "created_at": now,
+        "updated_at": now,
         "expires_at": expires_at,
         "consent_id": None,
         "consent_artefact": None,
@@ -108,19 +232,18 @@ async def on_init_consent_request(
 
     # Prepare callback response
     callback_response = {
-        "requestId": str(request.requestId),
-        "timestamp": datetime.now().isoformat(),
+        "requestId": request.requestId,
+        "timestamp": now,
         "consentRequest": {
             "id": consent_request_id
         },
         "resp": {
-            "requestId": str(uuid4())
+            "requestId": new_uuid()
         }
     }
 
     # Callback to Gateway (which will forward to HIU)
-    background_tasks.add_task(
-        callback_to_gateway,
+    enqueue_callback(
         endpoint="/v0.5/consent-requests/on-init",
         payload=callback_response,
         request_id=str(request.requestId)
@@ -129,46 +252,52 @@ async def on_init_consent_request(
     return {"acknowledged": True, "consentRequestId": consent_request_id}
 
 
-@router.post("/consent-requests/status")
+@router.post("/consent-requests/status", openapi_extra=_openapi_body(_STATUS_ADAPTER))
 async def get_consent_request_status(
-    request: ConsentRequestStatusRequest,
-    background_tasks: BackgroundTasks,
+    raw: Request,
     db = Depends(get_database)
 ):
     """
     Get status of consent request.
 
     Args:
-        request: Status request
-        background_tasks: Background tasks
+        raw: HTTP request carrying the status request JSON body
         db: Database connection
 
     Returns:
         Acknowledgement
     """
+    request = await _validate_body(raw, _STATUS_ADAPTER)
+
     logger.info(f"Status request for consent request {request.consentRequestId}")
 
-    # Find consent request
-    consent_req = await db.consent_requests.find_one({
-        "consent_request_id": str(request.consentRequestId)
-    })
+    # Find consent request, from the cache when it was looked up recently
+    consent_request_id = str(request.consentRequestId)
+    consent_req = consent_request_cache.get(consent_request_id)
+    if consent_req is None:
+        generation = consent_request_generation()
+        consent_req = await db.consent_requests.find_one(
+            {"consent_request_id": consent_request_id},
+            projection=_STATUS_PROJECTION
+        )
+        if consent_req:
+            cache_consent_request(consent_request_id, consent_req, generation)
 
     if not consent_req:
         # Return error callback
         error_response = {
-            "requestId": str(request.requestId),
-            "timestamp": datetime.now().isoformat(),
+            "requestId": request.requestId,
+            "timestamp": datetime.now(timezone.utc),
             "error": {
                 "code": 1000,
                 "message": f"Consent request {request.consentRequestId} not found"
             },
             "resp": {
-                "requestId": str(uuid4())
+                "requestId": new_uuid()
             }
         }
 
-        background_tasks.add_task(
-            callback_to_gateway,
+        enqueue_callback(
             endpoint="/v0.5/consent-requests/on-status",
             payload=error_response,
             request_id=str(request.requestId)
@@ -178,12 +307,12 @@ async def get_consent_request_status(
 
     # Prepare status response
     status_response = {
-        "requestId": str(request.requestId),
-        "timestamp": datetime.now().isoformat(),
+        "requestId": request.requestId,
+        "timestamp": datetime.now(timezone.utc),
         "consentRequest": {
             "id": consent_req["consent_request_id"],
             "status": consent_req["status"],
-            "createdAt": consent_req["created_at"].isoformat(),
+            "createdAt": consent_req["created_at"],
             "purpose": consent_req["consent_request"]["consent"]["purpose"],
             "patient": consent_req["consent_request"]["consent"]["patient"],
             "hiu": consent_req["consent_request"]["consent"]["hiu"],
@@ -191,13 +320,12 @@ async def get_consent_request_status(
             "permission": consent_req["consent_request"]["consent"]["permission"]
         },
         "resp": {
-            "requestId": str(uuid4())
+            "requestId": new_uuid()
         }
     }
 
     # Callback to Gateway
-    background_tasks.add_task(
-        callback_to_gateway,
+    enqueue_callback(
         endpoint="/v0.5/consent-requests/on-status",
         payload=status_response,
         request_id=str(request.requestId)
@@ -206,46 +334,51 @@ async def get_consent_request_status(
     return {"acknowledged": True}
 
 
-@router.post("/consents/fetch")
+@router.post("/consents/fetch", openapi_extra=_openapi_body(_FETCH_ADAPTER))
 async def fetch_consent_artefact(
-    request: ConsentFetchRequest,
-    background_tasks: BackgroundTasks,
+    raw: Request,
     db = Depends(get_database)
 ):
     """
     Fetch consent artefact by consent ID.
 
     Args:
-        request: Fetch request
-        background_tasks: Background tasks
+        raw: HTTP request carrying the fetch request JSON body
         db: Database connection
 
     Returns:
         Acknowledgement
     """
+    request = await _validate_body(raw, _FETCH_ADAPTER)
+
     logger.info(f"Fetch request for consent {request.consentId}")
 
-    # Find consent artefact
-    consent = await db.consent_artefacts.find_one({
-        "consent_id": str(request.consentId)
-    })
+    # Find consent artefact; artefacts are immutable, so cached ones never go stale
+    consent_id = str(request.consentId)
+    consent = consent_artefact_cache.get(consent_id)
+    if consent is None:
+        consent = await db.consent_artefacts.find_one(
+            {"consent_id": consent_id},
+            projection=_FETCH_PROJECTION
+        )
+        if consent:
+            consent_artefact_cache[consent_id] = consent
 
     if not consent:
         # Return error
         error_response = {
-            "requestId": str(request.requestId),
-            "timestamp": datetime.now().isoformat(),
+            "requestId": request.requestId,
+            "timestamp": datetime.now(timezone.utc),
             "error": {
                 "code": 1001,
                 "message": f"Consent {request.consentId} not found"
             },
             "resp": {
-                "requestId": str(uuid4())
+                "requestId": new_uuid()
             }
         }
 
-        background_tasks.add_task(
-            callback_to_gateway,
+        enqueue_callback(
             endpoint="/v0.5/consents/on-fetch",
             payload=error_response,
             request_id=str(request.requestId)
@@ -255,17 +388,16 @@ async def fetch_consent_artefact(
 
     # Return consent artefact
     fetch_response = {
-        "requestId": str(request.requestId),
-        "timestamp": datetime.now().isoformat(),
+        "requestId": request.requestId,
+        "timestamp": datetime.now(timezone.utc),
         "consent": consent["consent_artefact"],
         "resp": {
-            "requestId": str(uuid4())
+            "requestId": new_uuid()
         }
     }
 
     # Callback to Gateway
-    background_tasks.add_task(
-        callback_to_gateway,
+    enqueue_callback(
         endpoint="/v0.5/consents/on-fetch",
         payload=fetch_response,
         request_id=str(request.requestId)
@@ -274,26 +406,98 @@ async def fetch_consent_artefact(
     return {"acknowledged": True}
 
 
+def enqueue_callback(endpoint: str, payload: dict, request_id: str):
+    """
+    Queue a callback to the Gateway without waiting for it to be sent.
+
+    Args:
+        endpoint: Gateway endpoint
+        payload: Callback payload
+        request_id: Request ID for logging
+    """
+    if _callback_queue is None:
+        raise RuntimeError("Callback workers not started")
+    try:
+        _callback_queue.put_nowait((endpoint, payload, request_id))
+    except asyncio.QueueFull:
+        logger.error(f"Callback queue full, dropping callback {request_id} to {endpoint}")
+
+
+async def _callback_worker(queue: asyncio.Queue):
+    """Send queued callbacks one after another over the shared client."""
+    while True:
+        endpoint, payload, request_id = await queue.get()
+        try:
+            await callback_to_gateway(endpoint, payload, request_id)
+        finally:
+            queue.task_done()
+
+
+def start_callback_workers():
+    """Create the callback queue and its workers. Call on startup."""
+    global _callback_queue
+    _callback_queue = asyncio.Queue(maxsize=_CALLBACK_QUEUE_SIZE)
+    _callback_workers[:] = [
+        asyncio.create_task(_callback_worker(_callback_queue))
+        for _ in range(_CALLBACK_WORKERS)
+    ]
+
+
+async def stop_callback_workers(timeout: float = 10.0):
+    """
+    Send what is still queued, then stop the workers. Call on shutdown,
+    before the shared HTTP client is closed.
+    """
+    global _callback_queue
+    if _callback_queue is None:
+        return
+
+    try:
+        await asyncio.wait_for(_callback_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dropping {_callback_queue.qsize()} unsent callbacks on shutdown")
+
+    for worker in _callback_workers:
+        worker.cancel()
+    await asyncio.gather(*_callback_workers, return_exceptions=True)
+    _callback_workers.clear()
+    _callback_queue = None
+
+
 async def callback_to_gateway(endpoint: str, payload: dict, request_id: str):
     """
     Send callback to Gateway.
 
+    Network errors, 429s and 5xx responses are retried with jittered
+    exponential backoff; other 4xx responses are not.
+
     Args:
         endpoint: Gateway endpoint
         payload: Callback payload
         request_id: Request ID for logging
     """
-    gateway_url = "http://gateway:8090"
-    full_url = f"{gateway_url}{endpoint}"
-
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                full_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            logger.info(f"Callback {request_id} sent to Gateway: {response.status_code}")
+        content = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+        for attempt in range(1, _CALLBACK_ATTEMPTS + 1):
+            try:
+                # Shared client is rooted at the Gateway URL
+                response = await get_http_client().post(
+                    endpoint,
+                    content=content,
+                    headers=_JSON_HEADERS
+                )
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+                error = f"Gateway returned {response.status_code}"
+            except httpx.TransportError as e:
+                error = str(e)
+
+            if attempt == _CALLBACK_ATTEMPTS:
+                raise RuntimeError(f"{error} after {attempt} attempts")
+            delay = _CALLBACK_BACKOFF * 2 ** (attempt - 1)
+            await asyncio.sleep(delay / 2 + random.random() * delay)
+
+        response.raise_for_status()
+        logger.info(f"Callback {request_id} sent to Gateway: {response.status_code}")
     except Exception as e:
         logger.error(f"Failed to callback to Gateway: {str(e)}")
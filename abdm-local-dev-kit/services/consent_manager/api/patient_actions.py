@@ -9,12 +9,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 import logging
-import httpx
 
 from models.consent import ConsentStatus
-from dependencies import get_database
+from dependencies import get_database, get_http_client
+from ids import new_uuid
+from cache import invalidate_consent_request
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +76,7 @@ async def approve_consent_request(
         )
 
     # Generate consent ID
-    consent_id = str(uuid4())
+    consent_id = new_uuid()
 
     # Extract original request details
     original_request = consent_req["consent_request"]["consent"]
@@ -128,16 +129,17 @@ async def approve_consent_request(
             }
         }
     )
+    invalidate_consent_request(consent_request_id)
 
     logger.info(f"Consent {consent_id} granted for request {consent_request_id}")
 
     # Send notification to HIU via Gateway
     notification_payload = {
-        "requestId": str(uuid4()),
+        "requestId": new_uuid(),
         "timestamp": datetime.now().isoformat(),
         "notification": consent_artefact,
         "resp": {
-            "requestId": str(uuid4())
+            "requestId": new_uuid()
         }
     }
 
@@ -145,13 +147,8 @@ async def approve_consent_request(
     callback_url = consent_req.get("callback_url")
     if callback_url:
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    callback_url,
-                    json=notification_payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                logger.info(f"Consent notification sent to HIU: {response.status_code}")
+            response = await get_http_client().post(callback_url, json=notification_payload)
+            logger.info(f"Consent notification sent to HIU: {response.status_code}")
         except Exception as e:
             logger.error(f"Failed to notify HIU: {str(e)}")
 
@@ -205,32 +202,28 @@ async def deny_consent_request(
             }
         }
     )
+    invalidate_consent_request(consent_request_id)
 
     logger.info(f"Consent request {consent_request_id} denied")
 
     # Notify HIU
     notification_payload = {
-        "requestId": str(uuid4()),
+        "requestId": new_uuid(),
         "timestamp": datetime.now().isoformat(),
         "notification": {
             "status": ConsentStatus.DENIED.value,
             "consentRequestId": consent_request_id
         },
         "resp": {
-            "requestId": str(uuid4())
+            "requestId": new_uuid()
         }
     }
 
     callback_url = consent_req.get("callback_url")
     if callback_url:
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    callback_url,
-                    json=notification_payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                logger.info(f"Denial notification sent to HIU: {response.status_code}")
+            response = await get_http_client().post(callback_url, json=notification_payload)
+            logger.info(f"Denial notification sent to HIU: {response.status_code}")
         except Exception as e:
             logger.error(f"Failed to notify HIU: {str(e)}")
 
@@ -0,0 +1,40 @@
+"""
+In-process caches for consent lookups.
+
+Each worker process keeps its own copy, so entries written by another
+worker are only seen after they expire (status) or on a miss (artefacts).
+"""
+
+from cachetools import LRUCache, TTLCache
+
+# Projected consent_requests documents by consent_request_id. Status changes
+# are rare and invalidated by the patient action handlers; the TTL bounds
+# staleness across workers.
+consent_request_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# Projected consent_artefacts documents by consent_id. Artefacts never change
+# once granted, so they only leave the cache to make room.
+consent_artefact_cache: LRUCache = LRUCache(maxsize=10_000)
+
+
+# Bumped on every invalidation. A lookup that was in flight while a status
+# changed may have read the old document, so it must not be cached.
+_consent_request_generation = 0
+
+
+def consent_request_generation() -> int:
+    """Current invalidation generation; read it before querying Mongo."""
+    return _consent_request_generation
+
+
+def cache_consent_request(consent_request_id: str, doc: dict, generation: int):
+    """Cache a looked-up consent request unless it was invalidated meanwhile."""
+    if generation == _consent_request_generation:
+        consent_request_cache[consent_request_id] = doc
+
+
+def invalidate_consent_request(consent_request_id: str):
+    """Drop a consent request after its status changes."""
+    global _consent_request_generation
+    _consent_request_generation += 1
+    consent_request_cache.pop(consent_request_id, None)
@@ -2,12 +2,16 @@
 Dependencies for FastAPI dependency injection.
 """
 
+import httpx
 from fastapi import HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 # Global database connection
 db: AsyncIOMotorDatabase = None
 
+# Global HTTP client, shared so callbacks reuse keep-alive connections
+http_client: httpx.AsyncClient = None
+
 
 def set_database(database: AsyncIOMotorDatabase):
     """Set the global database connection."""
@@ -23,3 +27,19 @@ def get_database():
     if db is None:
         raise HTTPException(status_code=500, detail="Database not initialized")
     return db
+
+
+def set_http_client(client: httpx.AsyncClient):
+    """Set the global HTTP client."""
+    global http_client
+    http_client = client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for Gateway and HIU callbacks.
+    """
+    global http_client
+    if http_client is None:
+        raise RuntimeError("HTTP client not initialized")
+    return http_client
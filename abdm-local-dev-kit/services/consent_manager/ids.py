@@ -0,0 +1,40 @@
+"""
+ID generation helpers.
+
+Random UUIDs for consent request, consent and callback request IDs.
+"""
+
+import os
+
+# Random bytes are read from the kernel 4 KiB at a time and handed out 16
+# bytes per ID, so one os.urandom call covers 256 IDs. Only the event loop
+# thread generates IDs, so the buffer needs no lock.
+_BUFFER_SIZE = 4096
+_buffer = b""
+_pos = 0
+
+
+def _reset_buffer():
+    """Discard bytes inherited from the parent so forked workers never share IDs."""
+    global _buffer, _pos
+    _buffer = b""
+    _pos = 0
+
+
+os.register_at_fork(after_in_child=_reset_buffer)
+
+
+def new_uuid() -> str:
+    """
+    Return a random RFC 4122 version-4 UUID string.
+    """
+    global _buffer, _pos
+    if _pos >= len(_buffer):
+        _buffer = os.urandom(_BUFFER_SIZE)
+        _pos = 0
+    b = bytearray(_buffer[_pos:_pos + 16])
+    _pos += 16
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
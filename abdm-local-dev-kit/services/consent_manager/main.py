@@ -15,16 +15,17 @@ The Consent Manager:
 import logging
 import logging.config
 from fastapi import FastAPI, Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import httpx
 import uvicorn
 
 from config import settings
 from middleware.logging import LoggingMiddleware
 from middleware.auth import JWTAuthMiddleware
-from dependencies import set_database
+from dependencies import set_database, set_http_client
 
 # Configure logging
 logging_config = {
@@ -66,12 +67,16 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 # Global variables for database connection
 db_client: AsyncIOMotorClient = None
 db: AsyncIOMotorDatabase = None
 
+# Shared HTTP client for Gateway/HIU callbacks
+http_client: httpx.AsyncClient = None
+
 
 # ============================================================================
 # Middleware Setup
@@ -112,10 +117,20 @@ async def startup_event():
     """
     Initialize database connection on application startup.
     """
-    global db_client, db
+    global db_client, db, http_client
 
     logger.info(f"Starting {settings.service_name} service on port {settings.port}")
 
+    # One pooled client for every callback, so each one reuses a kept-alive
+    # connection instead of opening (and tearing down) its own
+    http_client = httpx.AsyncClient(
+        base_url=settings.gateway_url,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+    )
+    set_http_client(http_client)
+    consent_requests.start_callback_workers()
+
     try:
         # Create MongoDB client
         db_client = AsyncIOMotorClient(settings.mongo_uri)
@@ -142,10 +157,16 @@ async def shutdown_event():
     """
     Clean up resources on application shutdown.
     """
-    global db_client
+    global db_client, http_client
 
     logger.info(f"Shutting down {settings.service_name} service")
 
+    # Flush queued callbacks while the client they go out on is still open
+    await consent_requests.stop_callback_workers()
+
+    if http_client:
+        await http_client.aclose()
+
     if db_client:
         db_client.close()
         logger.info("MongoDB connection closed")
@@ -164,6 +185,20 @@ async def _create_indexes():
         await consent_collection.create_index("created_at")
         await consent_collection.create_index([("patient_id", 1), ("hiu_id", 1)])
 
+        # Status and fetch look these up by id. The HIU service keeps its own
+        # documents in the same collections without these fields, so the
+        # unique indexes only cover documents written here.
+        await db.consent_requests.create_index(
+            "consent_request_id",
+            unique=True,
+            partialFilterExpression={"consent_request_id": {"$type": "string"}}
+        )
+        await db.consent_artefacts.create_index(
+            "consent_id",
+            unique=True,
+            partialFilterExpression={"consent_id": {"$type": "string"}}
+        )
+
         logger.info("Database indexes created successfully")
     except Exception as exc:
         logger.error(f"Failed to create indexes: {str(exc)}", exc_info=True)
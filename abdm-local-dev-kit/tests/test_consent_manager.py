@@ -0,0 +1,410 @@
+"""
+Consent Manager Unit Tests
+
+Drives the consent request routes in-process against an in-memory
+stand-in for MongoDB and an httpx.MockTransport Gateway.
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+# The service imports its modules top-level (from dependencies import ...)
+sys.path.insert(0, str(Path(__file__).parent.parent / "services" / "consent_manager"))
+
+import cache
+import dependencies
+from api import consent_requests
+
+
+class FakeCollection:
+    """Minimal async stand-in for a Motor collection."""
+
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+        self.find_calls = 0
+        # Set by tests that need to hold a lookup in flight
+        self.started = None
+        self.release = None
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+    async def find_one(self, query, projection=None):
+        self.find_calls += 1
+        match = next(
+            (d for d in self.docs if all(d.get(k) == v for k, v in query.items())),
+            None
+        )
+        match = dict(match) if match else None
+        if self.release is not None:
+            self.started.set()
+            await self.release.wait()
+        return match
+
+
+class FakeDatabase:
+    def __init__(self, consent_requests=None, consent_artefacts=None):
+        self.consent_requests = FakeCollection(consent_requests)
+        self.consent_artefacts = FakeCollection(consent_artefacts)
+
+
+def gateway_client(handler) -> httpx.AsyncClient:
+    """Shared client whose requests are answered by handler."""
+    return httpx.AsyncClient(base_url="http://gateway", transport=httpx.MockTransport(handler))
+
+
+def accept_all(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(202)
+
+
+def consent_request_doc(status: str = "REQUESTED") -> dict:
+    return {
+        "consent_request_id": str(uuid.uuid4()),
+        "status": status,
+        "created_at": "2024-01-01T00:00:00",
+        "hi_types": ["OPConsultation"],
+        "consent_request": {
+            "consent": {
+                "purpose": {"text": "Care Management", "code": "CAREMGT"},
+                "patient": {"id": "22-7225-4829-5255@sbx"},
+                "hiu": {"id": "HIU-1"},
+                "permission": {"accessMode": "VIEW"}
+            }
+        }
+    }
+
+
+def status_body(consent_request_id: str) -> dict:
+    return {
+        "requestId": str(uuid.uuid4()),
+        "timestamp": "2024-01-01T12:00:00.000Z",
+        "consentRequestId": consent_request_id
+    }
+
+
+def consent_request_body() -> dict:
+    return {
+        "requestId": str(uuid.uuid4()),
+        "timestamp": "2024-01-01T12:00:00.000Z",
+        "consent": {
+            "purpose": {"text": "Care Management", "code": "CAREMGT"},
+            "patient": {"id": "22-7225-4829-5255@sbx"},
+            "hip": {"id": "HIP-1"},
+            "hiu": {"id": "HIU-1"},
+            "requester": {"name": "Dr. Test"},
+            "hiTypes": ["OPConsultation", "Prescription"],
+            "permission": {
+                "accessMode": "VIEW",
+                "dateRange": {"from": "2023-01-01T00:00:00.000Z", "to": "2024-01-01T00:00:00.000Z"},
+                "dataEraseAt": "2024-06-01T00:00:00.000Z",
+                "frequency": {"unit": "HOUR", "value": 1, "repeats": 0}
+            },
+            "consentNotificationUrl": "http://hiu/notify"
+        }
+    }
+
+
+async def run_with_service(db, handler, scenario):
+    """Run scenario(client) with the service wired to db and a mock Gateway."""
+    app = FastAPI()
+    app.include_router(consent_requests.router)
+    dependencies.set_database(db)
+    dependencies.set_http_client(gateway_client(handler))
+    consent_requests.start_callback_workers()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://cm") as client:
+            return await scenario(client)
+    finally:
+        await consent_requests.stop_callback_workers()
+        await dependencies.get_http_client().aclose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.consent_request_cache.clear()
+    cache.consent_artefact_cache.clear()
+    yield
+    cache.consent_request_cache.clear()
+    cache.consent_artefact_cache.clear()
+
+
+class TestConsentRequestCache:
+
+    def test_repeat_status_lookups_are_served_from_cache(self):
+        doc = consent_request_doc()
+        db = FakeDatabase(consent_requests=[doc])
+
+        async def scenario(client):
+            for _ in range(3):
+                r = await client.post("/v0.5/consent-requests/status", json=status_body(doc["consent_request_id"]))
+                assert r.status_code == 200
+
+        asyncio.run(run_with_service(db, accept_all, scenario))
+
+        assert db.consent_requests.find_calls == 1
+        assert doc["consent_request_id"] in cache.consent_request_cache
+
+    def test_lookup_in_flight_during_invalidation_is_not_cached(self):
+        doc = consent_request_doc()
+        db = FakeDatabase(consent_requests=[doc])
+        db.consent_requests.started = asyncio.Event()
+        db.consent_requests.release = asyncio.Event()
+        consent_request_id = doc["consent_request_id"]
+
+        async def scenario(client):
+            lookup = asyncio.create_task(
+                client.post("/v0.5/consent-requests/status", json=status_body(consent_request_id))
+            )
+            await db.consent_requests.started.wait()
+            # Approve/deny lands while the old document is on its way back
+            cache.invalidate_consent_request(consent_request_id)
+            db.consent_requests.release.set()
+            assert (await lookup).status_code == 200
+
+        asyncio.run(run_with_service(db, accept_all, scenario))
+
+        assert consent_request_id not in cache.consent_request_cache
+
+
+class GatewayStub:
+    """MockTransport handler that answers with a scripted sequence of outcomes."""
+
+    def __init__(self, *outcomes):
+        # Each outcome is a status code, or an exception to raise
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0) if self.outcomes else 202
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of waiting them out."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def send_callback(gateway: GatewayStub):
+    async def run():
+        dependencies.set_http_client(gateway_client(gateway))
+        try:
+            await consent_requests.callback_to_gateway("/v0.5/consents/on-fetch", {"requestId": "r"}, "r")
+        finally:
+            await dependencies.get_http_client().aclose()
+
+    asyncio.run(run())
+
+
+class TestCallbackRetry:
+
+    @pytest.mark.parametrize("failure", [
+        429,
+        500,
+        503,
+        httpx.ConnectError("connection refused"),
+        httpx.ReadTimeout("timed out"),
+    ])
+    def test_transient_failure_is_retried(self, sleeps, caplog, failure):
+        gateway = GatewayStub(failure, 202)
+
+        send_callback(gateway)
+
+        assert len(gateway.requests) == 2
+        assert len(sleeps) == 1
+        assert "Failed to callback" not in caplog.text
+
+    def test_gives_up_after_three_attempts_with_growing_backoff(self, sleeps, caplog):
+        gateway = GatewayStub(503, 503, 503)
+
+        send_callback(gateway)
+
+        assert len(gateway.requests) == 3
+        # ~0.5s then ~1s, each jittered to [delay / 2, delay * 1.5)
+        assert len(sleeps) == 2
+        assert 0.25 <= sleeps[0] < 0.75
+        assert 0.5 <= sleeps[1] < 1.5
+        assert "Gateway returned 503 after 3 attempts" in caplog.text
+
+    @pytest.mark.parametrize("status", [400, 401, 404, 422])
+    def test_client_error_is_not_retried(self, sleeps, caplog, status):
+        gateway = GatewayStub(status)
+
+        send_callback(gateway)
+
+        assert len(gateway.requests) == 1
+        assert sleeps == []
+        # Reaches raise_for_status and is logged
+        assert f"Client error '{status}" in caplog.text
+
+    def test_body_is_sent_once_encoded_on_every_attempt(self, sleeps):
+        gateway = GatewayStub(500, 202)
+
+        send_callback(gateway)
+
+        assert [r.content for r in gateway.requests] == [b'{"requestId":"r"}'] * 2
+        assert all(r.headers["content-type"] == "application/json" for r in gateway.requests)
+
+
+class TestCallbackQueue:
+
+    def test_enqueue_before_startup_raises(self):
+        with pytest.raises(RuntimeError):
+            consent_requests.enqueue_callback("/v0.5/consents/on-fetch", {}, "r")
+
+    def test_shutdown_drains_queue_before_closing_client(self, monkeypatch):
+        # main.py's shutdown order is what guarantees the drain
+        import main
+
+        gateway = GatewayStub()
+
+        async def run():
+            client = gateway_client(gateway)
+            dependencies.set_http_client(client)
+            monkeypatch.setattr(main, "http_client", client)
+            monkeypatch.setattr(main, "db_client", None)
+            consent_requests.start_callback_workers()
+            for i in range(20):
+                consent_requests.enqueue_callback("/v0.5/consents/on-fetch", {"n": i}, str(i))
+
+            await main.shutdown_event()
+            return client
+
+        client = asyncio.run(run())
+
+        assert len(gateway.requests) == 20
+        assert client.is_closed
+        assert consent_requests._callback_queue is None
+        assert consent_requests._callback_workers == []
+
+    def test_full_queue_drops_and_logs(self, monkeypatch, caplog):
+        monkeypatch.setattr(consent_requests, "_CALLBACK_QUEUE_SIZE", 2)
+        gateway = GatewayStub()
+
+        async def run():
+            dependencies.set_http_client(gateway_client(gateway))
+            consent_requests.start_callback_workers()
+            # No await between puts, so the workers cannot drain in between
+            for i in range(5):
+                consent_requests.enqueue_callback("/v0.5/consents/on-fetch", {"n": i}, str(i))
+            await consent_requests.stop_callback_workers()
+            await dependencies.get_http_client().aclose()
+
+        asyncio.run(run())
+
+        assert len(gateway.requests) == 2
+        assert caplog.text.count("Callback queue full") == 3
+
+    def test_worker_survives_failed_callbacks(self, sleeps):
+        requests = []
+
+        def gateway(request: httpx.Request) -> httpx.Response:
+            # Callback 0 is rejected outright, callback 1 keeps failing
+            requests.append(request)
+            n = orjson.loads(request.content)["n"]
+            return httpx.Response({0: 400, 1: 503}.get(n, 202))
+
+        async def run():
+            dependencies.set_http_client(gateway_client(gateway))
+            consent_requests.start_callback_workers()
+            for i in range(6):
+                consent_requests.enqueue_callback("/v0.5/consents/on-fetch", {"n": i}, str(i))
+            await consent_requests.stop_callback_workers()
+            await dependencies.get_http_client().aclose()
+
+        asyncio.run(run())
+
+        # 1 + 3 attempts for the two failures, then one each for the rest
+        assert len(requests) == 8
+
+
+class TestOnInit:
+
+    def post_on_init(self, db, gateway, **kwargs):
+        async def scenario(client):
+            return await client.post("/v0.5/consent-requests/on-init", **kwargs)
+
+        return asyncio.run(run_with_service(db, gateway, scenario))
+
+    def test_malformed_json_is_422_json_invalid(self):
+        db = FakeDatabase()
+        gateway = GatewayStub()
+
+        r = self.post_on_init(db, gateway, content=b'{"requestId": ', headers={"Content-Type": "application/json"})
+
+        assert r.status_code == 422
+        [error] = r.json()["detail"]
+        assert error["type"] == "json_invalid"
+        assert error["loc"][0] == "body"
+        assert db.consent_requests.docs == []
+        assert gateway.requests == []
+
+    def test_invalid_body_is_422_with_body_locations(self):
+        db = FakeDatabase()
+        gateway = GatewayStub()
+        body = consent_request_body()
+        body["requestId"] = "not-a-uuid"
+        del body["consent"]["hiu"]
+
+        r = self.post_on_init(db, gateway, json=body)
+
+        assert r.status_code == 422
+        locs = [tuple(e["loc"]) for e in r.json()["detail"]]
+        assert ("body", "requestId") in locs
+        assert ("body", "consent", "hiu") in locs
+        assert all(loc[0] == "body" for loc in locs)
+        assert db.consent_requests.docs == []
+        assert gateway.requests == []
+
+    def test_stores_request_as_received_and_calls_back(self):
+        db = FakeDatabase()
+        gateway = GatewayStub()
+        body = consent_request_body()
+
+        r = self.post_on_init(db, gateway, json=body)
+
+        assert r.status_code == 200
+        consent_request_id = r.json()["consentRequestId"]
+        [doc] = db.consent_requests.docs
+        assert doc["consent_request_id"] == consent_request_id
+        assert doc["status"] == "REQUESTED"
+        assert doc["patient_abha"] == "22-7225-4829-5255"
+
+        # Stored exactly as sent: approve_consent_request reads
+        # dataEraseAt back as the caller's ISO string
+        assert doc["consent_request"] == body
+        assert datetime.fromisoformat(
+            doc["consent_request"]["consent"]["permission"]["dataEraseAt"]
+        ) == datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+        # One clock read serves every timestamp
+        assert doc["created_at"].tzinfo is timezone.utc
+        assert doc["updated_at"] == doc["created_at"]
+        assert doc["expires_at"] - doc["created_at"] == timedelta(days=7)
+
+        [callback] = gateway.requests
+        assert callback.url.path == "/v0.5/consent-requests/on-init"
+        payload = orjson.loads(callback.content)
+        assert payload["requestId"] == body["requestId"]
+        assert payload["consentRequest"] == {"id": consent_request_id}
+        assert datetime.fromisoformat(payload["timestamp"]) == doc["created_at"]